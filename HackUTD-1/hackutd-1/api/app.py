@@ -24,6 +24,7 @@ RealTimeSentimentAnalyzer = realtime_module.RealTimeSentimentAnalyzer
 sys.path.insert(0, str(current_dir))
 from csr_router import CSRRouter
 from customer_db import CustomerDB
+from customer_journal import CustomerJournal
 from call_manager import CallManager
 
 from flask import Flask, request, jsonify
@@ -64,10 +65,32 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Credentials', 'false')
     return response
 
+
+def _load_customer_repository():
+    """Open the shared SQLite customer store if CUSTOMER_SQLITE_PATH is set"""
+    db_path = os.environ.get('CUSTOMER_SQLITE_PATH')
+    if not db_path:
+        return None
+    # customer_repository.py lives at the repo root, next to the voice bot
+    repo_root = parent_dir.parent.parent
+    # For its sqlite_connections import; appended so api/customer_db.py still wins
+    if str(repo_root) not in sys.path:
+        sys.path.append(str(repo_root))
+    repo_spec = importlib.util.spec_from_file_location("customer_repository", repo_root / "customer_repository.py")
+    repo_module = importlib.util.module_from_spec(repo_spec)
+    repo_spec.loader.exec_module(repo_module)
+    print(f"Using SQLite customer store: {db_path}")
+    return repo_module.SQLiteCustomerRepository(db_path)
+
+
 # Initialize components
 analyzer = RealTimeSentimentAnalyzer()
 csr_router = CSRRouter()
-customer_db = CustomerDB()
+# New customers are journaled under hackutd-1/data (override with CUSTOMER_DATA_DIR)
+customer_db = CustomerDB(
+    repository=_load_customer_repository(),
+    journal=CustomerJournal(os.environ.get('CUSTOMER_DATA_DIR', 'data'))
+)
 call_manager = CallManager()
 
 # Store active calls (legacy - for backward compatibility)
@@ -3,7 +3,7 @@ Mock Customer Database
 Stores customer information for the dashboard
 """
 
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 from datetime import datetime, timedelta
 import random
 
@@ -11,8 +11,36 @@ import random
 class CustomerDB:
     """Mock customer database"""
     
-    def __init__(self):
-        self.customers = self._initialize_customers()
+    def __init__(self, repository=None, journal=None):
+        """
+        Args:
+            repository: Optional shared store (e.g. SQLiteCustomerRepository).
+                When given, lookups and inserts go to it instead of the
+                in-memory mock data.
+            journal: Optional CustomerJournal that makes in-memory inserts
+                durable; its snapshot and journal are replayed over the
+                mock data at startup.
+        """
+        self.repository = repository
+        self.journal = journal if repository is None else None
+        self.customers = {} if repository is not None else self._initialize_customers()
+        if self.journal is not None:
+            self.customers.update(self.journal.load())
+        
+        # Secondary indexes, keyed once at insert time
+        self._digits_index: Dict[str, Dict] = {}
+        self._last10_index: Dict[str, Dict] = {}
+        for key, customer in self.customers.items():
+            self._index_customer(key, customer)
+    
+    def _index_customer(self, key: str, customer: Dict):
+        """Add a customer to the digits-only and last-10-digits indexes"""
+        digits = ''.join(filter(str.isdigit, key))
+        if not digits:
+            return
+        self._digits_index.setdefault(digits, customer)
+        if len(digits) >= 10:
+            self._last10_index.setdefault(digits[-10:], customer)
     
     def _initialize_customers(self) -> Dict[str, Dict]:
         """Initialize mock customer data"""
@@ -106,44 +134,28 @@ class CustomerDB:
     
     def get_customer(self, phone_number: str) -> Optional[Dict]:
         """Get customer information by phone number"""
-        # Normalize phone number (remove dashes, spaces, etc.)
-        normalized = ''.join(filter(str.isdigit, phone_number))
+        if self.repository is not None:
+            return self.repository.get_by_phone(phone_number)
         
         # Try exact match first (with original format)
-        if phone_number in self.customers:
-            return self.customers[phone_number]
-        
-        # Try with +1 prefix if it's a US number (11 digits)
-        if len(normalized) == 11 and normalized.startswith('1'):
-            with_plus = f"+{normalized}"
-            if with_plus in self.customers:
-                return self.customers[with_plus]
-        
-        # Try normalized exact match
-        if normalized in self.customers:
-            return self.customers[normalized]
+        customer = self.customers.get(phone_number)
+        if customer is not None:
+            return customer
         
-        # Try with last 10 digits
-        if len(normalized) >= 10:
-            last_10 = normalized[-10:]
-            if last_10 in self.customers:
-                return self.customers[last_10]
-            # Also try with +1 prefix for 10-digit numbers
-            with_plus_10 = f"+1{last_10}"
-            if with_plus_10 in self.customers:
-                return self.customers[with_plus_10]
-        
-        # Try matching against all customer keys (normalize each key too)
-        for key, customer in self.customers.items():
-            key_normalized = ''.join(filter(str.isdigit, key))
-            if key_normalized == normalized:
-                return customer
-            if len(key_normalized) >= 10 and len(normalized) >= 10:
-                if key_normalized[-10:] == normalized[-10:]:
-                    return customer
+        # Normalize phone number (remove dashes, spaces, etc.)
+        normalized = ''.join(filter(str.isdigit, phone_number))
         
-        # Return None if not found
-        return None
+        # Try digits-only match, then last 10 digits (drops +1 country code)
+        customer = self._digits_index.get(normalized)
+        if customer is None and len(normalized) >= 10:
+            customer = self._last10_index.get(normalized[-10:])
+        return customer
+    
+    def get_customers_by_phones(self, phone_numbers: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """Resolve many phone numbers at once (one IN query on a repository)"""
+        if self.repository is not None:
+            return self.repository.get_by_phones(phone_numbers)
+        return {phone: self.get_customer(phone) for phone in phone_numbers}
     
     def create_customer(self, phone_number: str, **kwargs) -> Dict:
         """Create a new customer record"""
@@ -166,6 +178,15 @@ class CustomerDB:
             'location': kwargs.get('location', 'Unknown')
         }
         
-        self.customers[normalized] = customer
+        if self.repository is not None:
+            self.repository.upsert(customer)
+        else:
+            self.customers[normalized] = customer
+            # New record replaces any previous owner of this number
+            self._digits_index[normalized] = customer
+            if len(normalized) >= 10:
+                self._last10_index[normalized[-10:]] = customer
+            if self.journal is not None:
+                self.journal.append(normalized, customer, self.customers)
         return customer
 
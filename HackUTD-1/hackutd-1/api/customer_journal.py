@@ -0,0 +1,104 @@
+"""
+Customer Journal
+Append-only, durable write log for CustomerDB
+
+Each create/update is appended as one JSON line, so a write is O(1). Every
+`compact_every` entries the full customer set is written to a base snapshot
+and the journal is truncated. Startup loads the snapshot and replays the
+journal on top of it; replays are idempotent upserts, so a crash between
+snapshot and truncate is harmless.
+"""
+
+import json
+import os
+import threading
+from typing import Dict
+
+
+class CustomerJournal:
+    """Append-only upsert journal with periodic snapshot compaction"""
+
+    def __init__(self, data_dir: str, compact_every: int = 1000, fsync: bool = True):
+        os.makedirs(data_dir, exist_ok=True)
+        self.snapshot_path = os.path.join(data_dir, 'customers_snapshot.json')
+        self.journal_path = os.path.join(data_dir, 'customers_journal.jsonl')
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._entries = 0
+        self._file = None
+
+    def load(self) -> Dict[str, Dict]:
+        """Return snapshot customers with the journal replayed on top"""
+        customers = {}
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r') as f:
+                customers.update(json.load(f))
+
+        entries = 0
+        if os.path.exists(self.journal_path):
+            valid_bytes = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    entry = json.loads(line)
+                    customers[entry['key']] = entry['customer']
+                    valid_bytes += len(line)
+                    entries += 1
+                torn = f.tell() != valid_bytes
+            if torn:
+                # Drop a torn final line from a crash mid-append, so the next
+                # append starts on a fresh line
+                print(f"Truncating incomplete entry at end of {self.journal_path}")
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+
+        self._entries = entries
+        return customers
+
+    def append(self, key: str, customer: Dict, customers: Dict[str, Dict]):
+        """
+        Durably record an upsert; compacts once the journal grows large
+
+        Args:
+            key: Key the customer is stored under
+            customer: The customer record
+            customers: The full current customer set (used for compaction)
+        """
+        line = json.dumps({'key': key, 'customer': customer}, separators=(',', ':'))
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.journal_path, 'a')
+            self._file.write(line + '\n')
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._entries += 1
+            if self._entries >= self.compact_every:
+                self._compact(customers)
+
+    def compact(self, customers: Dict[str, Dict]):
+        """Write the base snapshot and truncate the journal"""
+        with self._lock:
+            self._compact(customers)
+
+    def _compact(self, customers: Dict[str, Dict]):
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(dict(customers), f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.journal_path, 'w')
+        self._entries = 0
+
+    def close(self):
+        """Close the journal file"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,84 @@
+"""
+Customer Lookup Benchmark
+Measures get_customer_by_phone latency against synthetic customer sets
+
+Usage:
+    python benchmarks/bench_customer_lookup.py
+    python benchmarks/bench_customer_lookup.py --sizes 10000 1000000
+
+Note: the 10M run builds ~10M small dicts and needs several GB of RAM.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import customer_db
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+LOOKUPS = 100_000
+
+
+def synthetic_customers(count):
+    """Generate minimal customer records with unique phone numbers"""
+    return [
+        {'phone_number': f"+1{5550000000 + i}", 'name': f"Customer {i}"}
+        for i in range(count)
+    ]
+
+
+def bench_size(count, lookups):
+    """Build an index of `count` customers and time random lookups"""
+    customers = synthetic_customers(count)
+
+    start = time.perf_counter()
+    index = customer_db.build_customer_index(customers)
+    build_s = time.perf_counter() - start
+
+    # Install the synthetic index as the process-wide store
+    customer_db._customer_index = index
+
+    rng = random.Random(42)
+    # Hits use a different formatting than stored, to exercise normalization
+    hits = [str(5550000000 + rng.randrange(count)) for _ in range(lookups // 2)]
+    hits = [f"({n[:3]}) {n[3:6]}-{n[6:]}" for n in hits]
+    misses = [f"+1999{rng.randrange(10_000_000):07d}" for _ in range(lookups // 2)]
+    queries = hits + misses
+    rng.shuffle(queries)
+
+    start = time.perf_counter()
+    found = 0
+    for phone in queries:
+        if customer_db.get_customer_by_phone(phone) is not None:
+            found += 1
+    lookup_s = time.perf_counter() - start
+
+    del customers, index
+    customer_db._customer_index = None
+
+    return {
+        'customers': count,
+        'build_s': build_s,
+        'lookup_us': lookup_s / len(queries) * 1e6,
+        'hit_rate': found / len(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--lookups', type=int, default=LOOKUPS)
+    args = parser.parse_args()
+
+    print(f"{'customers':>12} {'build (s)':>10} {'lookup (us)':>12} {'hit rate':>9}")
+    for size in args.sizes:
+        r = bench_size(size, args.lookups)
+        print(f"{r['customers']:>12,} {r['build_s']:>10.2f} {r['lookup_us']:>12.2f} {r['hit_rate']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
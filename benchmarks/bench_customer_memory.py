@@ -0,0 +1,70 @@
+"""
+Customer Record Memory Benchmark
+Compares resident size of dict customers against CustomerRecord
+
+Usage:
+    python benchmarks/bench_customer_memory.py
+    python benchmarks/bench_customer_memory.py --count 1000000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from customer_record import CustomerRecord
+
+PLANS = ['Unlimited Premium', 'Unlimited Plus', 'Magenta Max', 'Magenta', 'Essentials', 'Go5G Plus', 'Go5G']
+LOCATIONS = ['Dallas, TX', 'Austin, TX', 'Seattle, WA', 'Chicago, IL', 'Los Angeles, CA']
+SENTIMENTS = ['neutral', 'satisfied', 'positive', 'negative', 'very_negative']
+
+
+def synthetic_customer(i):
+    """One customer dict shaped like customer_database.json, as json.load builds it"""
+    # Strings are rebuilt per record, like a JSON parser does, so nothing is shared
+    return {
+        'phone_number': f"+1{5550000000 + i}",
+        'name': f"Customer {i}",
+        'email': f"customer{i}@email.com",
+        'account_id': f"ACC{i:07d}",
+        'plan': ''.join(PLANS[i % len(PLANS)]),
+        'monthly_bill': 55.0 + (i % 50),
+        'account_age_months': i % 60,
+        'previous_calls': i % 9,
+        'last_call_date': "2025-10-25T10:30:00",
+        'previous_sentiment': ''.join(SENTIMENTS[i % len(SENTIMENTS)]),
+        'notes': "Generally satisfied customer.",
+        'location': ''.join(LOCATIONS[i % len(LOCATIONS)]),
+    }
+
+
+def measure(build, count):
+    """Peak traced bytes held by `count` records produced by `build`"""
+    gc.collect()
+    tracemalloc.start()
+    records = [build(i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=200_000)
+    args = parser.parse_args()
+
+    dict_bytes = measure(synthetic_customer, args.count)
+    record_bytes = measure(lambda i: CustomerRecord.from_dict(synthetic_customer(i)), args.count)
+
+    print(f"{'layout':<16} {'total (MB)':>11} {'per record (B)':>15}")
+    for name, size in (('dict', dict_bytes), ('CustomerRecord', record_bytes)):
+        print(f"{name:<16} {size / 1e6:>11.1f} {size / args.count:>15.0f}")
+    print(f"\nCustomerRecord uses {record_bytes / dict_bytes:.0%} of the dict layout")
+
+
+if __name__ == "__main__":
+    main()
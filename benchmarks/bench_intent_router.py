@@ -0,0 +1,70 @@
+"""
+Intent Router Benchmark
+Fast-path hit rate, precision and classification latency over a labeled set
+
+Usage:
+    python benchmarks/bench_intent_router.py
+    python benchmarks/bench_intent_router.py --data my_utterances.json
+
+The data file is a JSON list of {"text": ..., "intent": tool_name or null,
+"customer_plan": optional plan name}, where null means the utterance should
+go to the LLM. The default set is held out: none of it is drawn from the
+router's INTENT_TRAINING_DATA.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from intent_router import CONFIDENCE_THRESHOLD, classify_intent
+
+DEFAULT_DATA = os.path.join(os.path.dirname(__file__), 'intent_heldout.json')
+REPEATS = 200
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data', default=DEFAULT_DATA)
+    parser.add_argument('--threshold', type=float, default=CONFIDENCE_THRESHOLD)
+    args = parser.parse_args()
+
+    with open(args.data, 'r') as f:
+        examples = json.load(f)
+
+    routed = correct = fast_path_eligible = fast_path_hits = 0
+    mistakes = []
+    for example in examples:
+        match = classify_intent(example['text'], example.get('customer_plan'))
+        intent = match.intent if match.confidence >= args.threshold else None
+        if example['intent'] is not None:
+            fast_path_eligible += 1
+            fast_path_hits += intent == example['intent']
+        if intent is not None:
+            routed += 1
+            correct += intent == example['intent']
+        if intent != example['intent']:
+            mistakes.append((example['text'], example['intent'], intent, match))
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for example in examples:
+            classify_intent(example['text'], example.get('customer_plan'))
+    latency_us = (time.perf_counter() - start) / (REPEATS * len(examples)) * 1e6
+
+    print(f"Utterances:            {len(examples)}")
+    print(f"Routed to fast path:   {routed} ({routed / len(examples):.0%} of all turns)")
+    print(f"Fast-path precision:   {correct / routed:.0%}" if routed else "Fast-path precision:   n/a")
+    print(f"Hit rate on tool asks: {fast_path_hits}/{fast_path_eligible}")
+    print(f"Classify latency:      {latency_us:.1f} us/utterance")
+    if mistakes:
+        print("\nMisrouted:")
+        for text, expected, got, match in mistakes:
+            print(f"  {text!r}: expected {expected}, got {got} ({match.source}, {match.confidence:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+"""
+Call Sessions
+One session object per call, held in a pluggable store
+
+InMemorySessionStore keeps sessions in lock-sharded dicts for a single
+process. SQLiteSessionStore keeps them in a WAL-mode SQLite file, so several
+gunicorn workers can serve webhooks for the same call:
+
+    CALL_SESSION_STORE=sqlite gunicorn -w 4 voice_conversation:app
+
+All mutation goes through store.update(call_sid, fn), which runs fn on the
+session atomically (shard lock / IMMEDIATE transaction) and saves it.
+
+A SessionReaper evicts sessions past an idle TTL or an absolute TTL, so
+calls that never reach /end-call don't stay in memory.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from conversation_memory import ConversationMemory
+from sqlite_connections import ThreadLocalConnection
+
+DEFAULT_SHARDS = 16
+DEFAULT_IDLE_TTL = 30 * 60  # No webhook for this long: the call is gone
+DEFAULT_ABSOLUTE_TTL = 4 * 60 * 60
+DEFAULT_REAP_INTERVAL = 60
+
+
+class CallSession:
+    """
+    Everything the bot keeps for one call
+
+    Attributes:
+        call_sid (str): Twilio call SID
+        from_number (str): Caller's phone number
+        customer (dict): Customer record, or None for unknown callers
+        system_prompt (str): System prompt built once at call start
+        memory (ConversationMemory): Conversation history (None once ended)
+        metadata (dict): Call info, recordings, latencies and analysis
+        pending_reply (dict): Streamed reply still being spoken, if any
+    """
+
+    __slots__ = (
+        'call_sid', 'from_number', 'customer', 'system_prompt', 'memory',
+        'metadata', 'pending_reply', 'created_at', 'last_seen', 'ended_at',
+    )
+
+    def __init__(self, call_sid, from_number, customer=None, system_prompt='', memory=None, metadata=None):
+        now = time.time()
+        self.call_sid = call_sid
+        self.from_number = from_number
+        self.customer = customer
+        self.system_prompt = system_prompt
+        self.memory = memory
+        self.metadata = metadata if metadata is not None else {}
+        self.pending_reply = None
+        self.created_at = now
+        self.last_seen = now
+        self.ended_at = None
+
+    def end(self):
+        """Drop conversational state but keep metadata for recording callbacks"""
+        self.customer = None
+        self.system_prompt = ''
+        self.memory = None
+        self.pending_reply = None
+        self.ended_at = time.time()
+
+    def to_dict(self):
+        return {
+            'call_sid': self.call_sid,
+            'from_number': self.from_number,
+            'customer': dict(self.customer) if self.customer is not None else None,
+            'system_prompt': self.system_prompt,
+            'memory': self.memory.to_dict() if self.memory is not None else None,
+            'metadata': self.metadata,
+            'pending_reply': self.pending_reply,
+            'created_at': self.created_at,
+            'last_seen': self.last_seen,
+            'ended_at': self.ended_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        session = cls(data['call_sid'], data['from_number'], data['customer'], data['system_prompt'],
+                      ConversationMemory.from_dict(data['memory']) if data['memory'] else None,
+                      data['metadata'])
+        session.pending_reply = data['pending_reply']
+        session.created_at = data['created_at']
+        session.last_seen = data['last_seen']
+        session.ended_at = data['ended_at']
+        return session
+
+
+class _Shard:
+    """
+    One lock plus two time-ordered indexes of the same sessions
+
+    `sessions` is kept in last_seen order (touched sessions move to the
+    end) and `created` in creation order, so expired sessions are always
+    at the front of one or the other.
+    """
+
+    __slots__ = ('lock', 'sessions', 'created')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sessions = OrderedDict()  # call_sid -> session, oldest last_seen first
+        self.created = OrderedDict()  # call_sid -> created_at, oldest first
+
+    def pop(self, call_sid):
+        self.created.pop(call_sid, None)
+        return self.sessions.pop(call_sid, None)
+
+
+class InMemorySessionStore:
+    """Sessions in N time-ordered shards, each behind its own lock, for one process"""
+
+    def __init__(self, shards=DEFAULT_SHARDS):
+        self._shards = [_Shard() for _ in range(shards)]
+
+    def _shard(self, call_sid):
+        return self._shards[hash(call_sid) % len(self._shards)]
+
+    def put(self, session):
+        """Add or replace a session (appended as the newest in both indexes)"""
+        shard = self._shard(session.call_sid)
+        with shard.lock:
+            session.last_seen = time.time()
+            shard.pop(session.call_sid)
+            shard.sessions[session.call_sid] = session
+            shard.created[session.call_sid] = session.created_at
+
+    def get(self, call_sid):
+        """Return the session for a call, or None"""
+        shard = self._shard(call_sid)
+        with shard.lock:
+            return shard.sessions.get(call_sid)
+
+    def update(self, call_sid, fn):
+        """
+        Apply fn to a call's session atomically
+
+        Returns:
+            Whatever fn returns, or None if there is no such session
+        """
+        shard = self._shard(call_sid)
+        with shard.lock:
+            session = shard.sessions.get(call_sid)
+            if session is None:
+                return None
+            session.last_seen = time.time()
+            shard.sessions.move_to_end(call_sid)
+            return fn(session)
+
+    def delete(self, call_sid):
+        """Remove and return a session"""
+        shard = self._shard(call_sid)
+        with shard.lock:
+            return shard.pop(call_sid)
+
+    def reap(self, idle_before, created_before):
+        """
+        Remove sessions last seen before idle_before or created before
+        created_before, visiting only the expired ones
+
+        Returns:
+            list: (session, reason) pairs, reason is 'idle' or 'absolute'
+        """
+        reaped = []
+        for shard in self._shards:
+            with shard.lock:
+                while shard.created:
+                    call_sid, created_at = next(iter(shard.created.items()))
+                    if created_at >= created_before:
+                        break
+                    reaped.append((shard.pop(call_sid), 'absolute'))
+                while shard.sessions:
+                    call_sid, session = next(iter(shard.sessions.items()))
+                    if session.last_seen >= idle_before:
+                        break
+                    reaped.append((shard.pop(call_sid), 'idle'))
+        return reaped
+
+    def sessions(self):
+        """Snapshot of every session"""
+        result = []
+        for shard in self._shards:
+            with shard.lock:
+                result.extend(shard.sessions.values())
+        return result
+
+    def stats(self):
+        """Gauges: live and ended sessions, approximate bytes held (serialized size)"""
+        live = ended = size = 0
+        for shard in self._shards:
+            with shard.lock:
+                for session in shard.sessions.values():
+                    if session.ended_at is None:
+                        live += 1
+                    else:
+                        ended += 1
+                    size += len(json.dumps(session.to_dict(), default=str))
+        return {'live_sessions': live, 'ended_sessions': ended, 'approx_bytes': size}
+
+    def __len__(self):
+        return sum(len(shard.sessions) for shard in self._shards)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS call_sessions (
+    call_sid TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    ended INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_call_sessions_last_seen ON call_sessions(last_seen);
+CREATE INDEX IF NOT EXISTS idx_call_sessions_created_at ON call_sessions(created_at);
+"""
+
+
+class SQLiteSessionStore:
+    """Sessions as JSON rows in a WAL-mode SQLite file shared by every worker"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        # Autocommit; update() opens its own IMMEDIATE transaction
+        self._connection = ThreadLocalConnection(db_path, isolation_level=None, timeout=5.0)
+        self._connection().executescript(_SCHEMA)
+
+    @staticmethod
+    def _save(conn, session):
+        conn.execute(
+            "INSERT OR REPLACE INTO call_sessions (call_sid, data, created_at, last_seen, ended) VALUES (?, ?, ?, ?, ?)",
+            (session.call_sid, json.dumps(session.to_dict()), session.created_at, session.last_seen,
+             int(session.ended_at is not None))
+        )
+
+    def put(self, session):
+        """Add or replace a session"""
+        session.last_seen = time.time()
+        self._save(self._connection(), session)
+
+    def get(self, call_sid):
+        """Return a copy of the session for a call, or None"""
+        row = self._connection().execute(
+            "SELECT data FROM call_sessions WHERE call_sid = ?", (call_sid,)
+        ).fetchone()
+        return CallSession.from_dict(json.loads(row[0])) if row else None
+
+    def update(self, call_sid, fn):
+        """
+        Apply fn to a call's session inside one write transaction
+
+        Returns:
+            Whatever fn returns, or None if there is no such session
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM call_sessions WHERE call_sid = ?", (call_sid,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            session = CallSession.from_dict(json.loads(row[0]))
+            session.last_seen = time.time()
+            result = fn(session)
+            self._save(conn, session)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, call_sid):
+        """Remove and return a session"""
+        session = self.get(call_sid)
+        self._connection().execute("DELETE FROM call_sessions WHERE call_sid = ?", (call_sid,))
+        return session
+
+    def reap(self, idle_before, created_before):
+        """
+        Remove sessions last seen before idle_before or created before
+        created_before (index range scans, so only expired rows are read)
+
+        Returns:
+            list: (session, reason) pairs, reason is 'idle' or 'absolute'
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            reaped = {}
+            for reason, column, cutoff in (('absolute', 'created_at', created_before), ('idle', 'last_seen', idle_before)):
+                for call_sid, data in conn.execute(
+                    f"SELECT call_sid, data FROM call_sessions WHERE {column} < ?", (cutoff,)
+                ):
+                    reaped.setdefault(call_sid, (CallSession.from_dict(json.loads(data)), reason))
+            conn.executemany("DELETE FROM call_sessions WHERE call_sid = ?", [(call_sid,) for call_sid in reaped])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return list(reaped.values())
+
+    def sessions(self):
+        """Snapshot of every session"""
+        rows = self._connection().execute("SELECT data FROM call_sessions").fetchall()
+        return [CallSession.from_dict(json.loads(data)) for data, in rows]
+
+    def stats(self):
+        """Gauges: live and ended sessions, approximate bytes held (serialized size)"""
+        total, ended, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(ended), 0), COALESCE(SUM(LENGTH(data)), 0) FROM call_sessions"
+        ).fetchone()
+        return {'live_sessions': total - ended, 'ended_sessions': ended, 'approx_bytes': size}
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM call_sessions").fetchone()[0]
+
+
+class SessionReaper:
+    """
+    Background thread that evicts stale sessions
+
+    Args:
+        store: InMemorySessionStore or SQLiteSessionStore
+        idle_ttl (float): Seconds without a webhook before a session is evicted
+        absolute_ttl (float): Max session age in seconds
+        interval (float): Seconds between sweeps
+        on_evict (callable): fn(session, reason) for per-call cleanup
+    """
+
+    def __init__(self, store, idle_ttl=DEFAULT_IDLE_TTL, absolute_ttl=DEFAULT_ABSOLUTE_TTL,
+                 interval=DEFAULT_REAP_INTERVAL, on_evict=None, clock=time.time):
+        self.store = store
+        self.idle_ttl = idle_ttl
+        self.absolute_ttl = absolute_ttl
+        self.interval = interval
+        self.on_evict = on_evict
+        self.clock = clock
+        self.reaped = {'idle': 0, 'absolute': 0}
+        self.last_sweep_ms = 0.0
+        self._thread = None
+
+    def run_once(self):
+        """Evict everything expired now; returns the number of sessions evicted"""
+        started = time.perf_counter()
+        now = self.clock()
+        reaped = self.store.reap(now - self.idle_ttl, now - self.absolute_ttl)
+        for session, reason in reaped:
+            self.reaped[reason] += 1
+            if self.on_evict is not None:
+                try:
+                    self.on_evict(session, reason)
+                except Exception as e:
+                    print(f"⚠️ Session cleanup failed for {session.call_sid}: {e}")
+        self.last_sweep_ms = (time.perf_counter() - started) * 1000
+        if reaped:
+            print(f"🧹 Reaped {len(reaped)} stale call sessions")
+        return len(reaped)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️ Session reaper error: {e}")
+
+    def start(self):
+        """Start the daemon sweep thread (idempotent)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='session-reaper', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stats(self):
+        """Store gauges plus eviction counters"""
+        stats = self.store.stats()
+        stats.update({
+            'reaped_idle': self.reaped['idle'],
+            'reaped_absolute': self.reaped['absolute'],
+            'idle_ttl_seconds': self.idle_ttl,
+            'absolute_ttl_seconds': self.absolute_ttl,
+            'last_sweep_ms': round(self.last_sweep_ms, 3),
+        })
+        return stats
+
+
+def create_session_store(kind='memory', db_path='call_sessions.db'):
+    """
+    Build the configured session store
+
+    Args:
+        kind (str): 'memory' (one process) or 'sqlite' (shared across workers)
+        db_path (str): SQLite file for the shared store
+    """
+    if kind == 'sqlite':
+        return SQLiteSessionStore(db_path)
+    if kind == 'memory':
+        return InMemorySessionStore()
+    raise ValueError(f"Unknown session store: {kind}")
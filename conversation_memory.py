@@ -0,0 +1,180 @@
+"""
+Conversation Memory
+Token-budgeted call history: recent turns verbatim, older turns folded into a
+rolling summary off the hot path
+"""
+
+import re
+import threading
+from collections import deque
+
+DEFAULT_TOKEN_BUDGET = 400  # Recent turns kept verbatim
+DEFAULT_MAX_TURNS = 6
+DEFAULT_SUMMARY_TOKENS = 80
+
+_SENTENCE_RE = re.compile(r'[^.!?]+[.!?]?')
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token), good enough for budgeting"""
+    return len(text) // 4 + 1 if text else 0
+
+
+def truncate_to_tokens(text, max_tokens):
+    """Trim text to roughly max_tokens, cutting at a word boundary"""
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(' ', 1)[0] + '...'
+
+
+def extractive_summary(previous_summary, turns, max_tokens=DEFAULT_SUMMARY_TOKENS):
+    """
+    Summarize without a model call: everything the caller said, plus the
+    assistant sentences that carry numbers (amounts, dates, gigabytes)
+
+    Args:
+        previous_summary (str): Summary so far ('' if none)
+        turns (list): (user_message, assistant_message) pairs to fold in
+        max_tokens (int): Cap on the summary size
+
+    Returns:
+        str: The new summary
+    """
+    parts = [previous_summary] if previous_summary else []
+    for user_message, assistant_message in turns:
+        parts.append(f"Caller: {user_message.strip()}")
+        facts = [s.strip() for s in _SENTENCE_RE.findall(assistant_message or '') if any(c.isdigit() for c in s)]
+        if facts:
+            parts.append(f"Agent: {' '.join(facts)}")
+    summary = ' '.join(parts)
+    # Keep the newest facts when over budget
+    while estimate_tokens(summary) > max_tokens and len(parts) > 1:
+        parts.pop(0)
+        summary = ' '.join(parts)
+    return truncate_to_tokens(summary, max_tokens)
+
+
+class ConversationMemory:
+    """
+    History for one call, capped by a token budget
+
+    The newest turns stay verbatim in a bounded deque. Turns pushed out by
+    the budget are handed back from add_turn() as a batch to summarize off
+    the reply path; the summary comes back through apply_summary(). Until
+    then those turns are left out of the prompt. Only plain data is held,
+    so a memory round-trips through to_dict()/from_dict() for a shared
+    session store.
+
+    Args:
+        token_budget (int): Max estimated tokens of verbatim turns
+        max_turns (int): Max verbatim turns regardless of size
+        summary_tokens (int): Max estimated tokens of the summary
+    """
+
+    def __init__(self, token_budget=DEFAULT_TOKEN_BUDGET, max_turns=DEFAULT_MAX_TURNS,
+                 summary_tokens=DEFAULT_SUMMARY_TOKENS):
+        self.token_budget = token_budget
+        self.summary_tokens = summary_tokens
+        self.summary = ''
+        self.turn_count = 0
+        self._recent = deque(maxlen=max_turns)  # (user, assistant, tokens)
+        self._recent_tokens = 0
+        self._unsummarized = []
+        self._summarizing = False
+        self._lock = threading.Lock()
+
+    def add_turn(self, user_message, assistant_message):
+        """
+        Record one exchange, evicting old turns past the budget
+
+        Returns:
+            tuple: (previous_summary, turns) to summarize, or None if there is
+            nothing new or a summary is already in progress
+        """
+        tokens = estimate_tokens(user_message) + estimate_tokens(assistant_message)
+        with self._lock:
+            if len(self._recent) == self._recent.maxlen:
+                self._evict()
+            self._recent.append((user_message, assistant_message, tokens))
+            self._recent_tokens += tokens
+            self.turn_count += 1
+            # Always keep the latest exchange, even if it alone is over budget
+            while self._recent_tokens > self.token_budget and len(self._recent) > 1:
+                self._evict()
+            if self._summarizing:
+                return None
+            return self._take_batch()
+
+    def apply_summary(self, summary):
+        """
+        Store a finished summary
+
+        Returns:
+            tuple: The next (previous_summary, turns) batch if more turns were
+            evicted meanwhile, else None
+        """
+        with self._lock:
+            self.summary = truncate_to_tokens(summary.strip(), self.summary_tokens)
+            self._summarizing = False
+            return self._take_batch()
+
+    def _evict(self):
+        user_message, assistant_message, tokens = self._recent.popleft()
+        self._recent_tokens -= tokens
+        self._unsummarized.append((user_message, assistant_message))
+
+    def _take_batch(self):
+        if not self._unsummarized:
+            return None
+        turns, self._unsummarized = self._unsummarized, []
+        self._summarizing = True
+        return self.summary, turns
+
+    def messages(self):
+        """Chat messages for the prompt: summary (if any) then recent turns"""
+        with self._lock:
+            summary = self.summary
+            recent = list(self._recent)
+        messages = []
+        if summary:
+            messages.append({'role': 'system', 'content': f"Earlier in this call: {summary}"})
+        for user_message, assistant_message, _ in recent:
+            messages.append({'role': 'user', 'content': user_message})
+            messages.append({'role': 'assistant', 'content': assistant_message})
+        return messages
+
+    def prompt_tokens(self):
+        """Estimated tokens this memory adds to a prompt"""
+        with self._lock:
+            return self._recent_tokens + estimate_tokens(self.summary)
+
+    def to_dict(self):
+        """Plain-data state for serialization"""
+        with self._lock:
+            return {
+                'token_budget': self.token_budget,
+                'max_turns': self._recent.maxlen,
+                'summary_tokens': self.summary_tokens,
+                'summary': self.summary,
+                'turn_count': self.turn_count,
+                'recent': [list(turn) for turn in self._recent],
+                'unsummarized': [list(turn) for turn in self._unsummarized],
+                'summarizing': self._summarizing,
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a memory from to_dict() output"""
+        memory = cls(data['token_budget'], data['max_turns'], data['summary_tokens'])
+        memory.summary = data['summary']
+        memory.turn_count = data['turn_count']
+        for user_message, assistant_message, tokens in data['recent']:
+            memory._recent.append((user_message, assistant_message, tokens))
+            memory._recent_tokens += tokens
+        memory._unsummarized = [tuple(turn) for turn in data['unsummarized']]
+        memory._summarizing = data['summarizing']
+        return memory
+
+    def __len__(self):
+        return self.turn_count
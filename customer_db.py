@@ -5,13 +5,49 @@ Provides functions to access customer data from JSON file
 
 import json
 import os
+import threading
+import time
+from customer_record import CustomerRecord
+from customer_repository import SQLiteCustomerRepository, normalize_phone
+from customer_snapshot import SnapshotIndex, iter_json_array, write_snapshot
 
 DATABASE_FILE = 'customer_database.json'
 
+# Optional binary snapshot of the index, memory-mapped on later startups
+CUSTOMER_SNAPSHOT_PATH = os.environ.get('CUSTOMER_SNAPSHOT_PATH', '')
+
+# Optional SQLite backend (set CUSTOMER_SQLITE_PATH to enable)
+CUSTOMER_SQLITE_PATH = os.environ.get('CUSTOMER_SQLITE_PATH', '')
+
+# Process-wide phone index, built once on first lookup
+_customer_index = None
+_customer_index_lock = threading.Lock()
+
+# Background watcher that hot-reloads the index when the JSON file changes
+CUSTOMER_DB_RELOAD_INTERVAL = float(os.environ.get('CUSTOMER_DB_RELOAD_INTERVAL', '2.0'))
+_watcher_thread = None
+
+# Pluggable repository; when set, lookups go to it instead of the JSON index
+_repository = SQLiteCustomerRepository(CUSTOMER_SQLITE_PATH) if CUSTOMER_SQLITE_PATH else None
+
+def set_customer_repository(repository):
+    """
+    Route customer lookups through a repository (e.g. SQLiteCustomerRepository)
+    
+    Args:
+        repository: Object with get_by_phone(phone_number), or None to use
+            the in-memory JSON index
+    """
+    global _repository
+    _repository = repository
+
+def _database_path():
+    return os.path.join(os.path.dirname(__file__), DATABASE_FILE)
+
 def load_customer_database():
     """Load customer database from JSON file"""
     try:
-        db_path = os.path.join(os.path.dirname(__file__), DATABASE_FILE)
+        db_path = _database_path()
         with open(db_path, 'r') as f:
             return json.load(f)
     except FileNotFoundError:
@@ -21,6 +57,145 @@ def load_customer_database():
         print(f"❌ Invalid JSON in customer database")
         return []
 
+def build_customer_index(customers):
+    """
+    Build a canonical-phone -> customer hash index
+    
+    Args:
+        customers (iterable): Customer dicts as loaded from the database
+        
+    Returns:
+        dict: Mapping of canonical phone key to compact CustomerRecord
+    """
+    index = {}
+    for customer in customers:
+        key = normalize_phone(customer.get('phone_number'))
+        # First record wins, same as the old linear scan
+        if key and key not in index:
+            index[key] = CustomerRecord.from_dict(customer)
+    return index
+
+def stream_customer_index():
+    """
+    Build the customer index by streaming the JSON file record by record
+    
+    Returns:
+        dict: Mapping of canonical phone key to customer record
+    """
+    try:
+        return build_customer_index(iter_json_array(_database_path()))
+    except FileNotFoundError:
+        print(f"❌ Customer database not found: {DATABASE_FILE}")
+        return {}
+    except (json.JSONDecodeError, ValueError):
+        print(f"❌ Invalid JSON in customer database")
+        return {}
+
+def _load_index():
+    """Open a fresh snapshot if one exists, otherwise stream the JSON file"""
+    if not CUSTOMER_SNAPSHOT_PATH:
+        return stream_customer_index()
+    
+    try:
+        snapshot_fresh = os.path.getmtime(CUSTOMER_SNAPSHOT_PATH) >= os.path.getmtime(_database_path())
+    except OSError:
+        snapshot_fresh = False
+    if snapshot_fresh:
+        try:
+            return SnapshotIndex(CUSTOMER_SNAPSHOT_PATH)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable customer snapshot: {e}")
+    
+    index = stream_customer_index()
+    if index:
+        try:
+            write_snapshot(index, CUSTOMER_SNAPSHOT_PATH)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not write customer snapshot: {e}")
+    return index
+
+def get_customer_index():
+    """Return the process-wide customer index, loading it on first use"""
+    global _customer_index
+    index = _customer_index
+    if index is None:
+        with _customer_index_lock:
+            if _customer_index is None:
+                _customer_index = _load_index()
+            index = _customer_index
+    return index
+
+def reload_customer_database():
+    """
+    Rebuild the index from disk and swap it in atomically
+    
+    The new index is built before the swap, so concurrent lookups keep using
+    the old one until the new one is complete. A failed or empty load (e.g.
+    the file is mid-write) keeps the current index.
+    
+    Returns:
+        The index now in use
+    """
+    global _customer_index
+    index = _load_index()
+    with _customer_index_lock:
+        if index or not _customer_index:
+            _customer_index = index
+        else:
+            print("⚠️ Customer database reload produced no records, keeping current index")
+        return _customer_index
+
+def _database_signature():
+    """(mtime, size) of the JSON file, or None if it can't be read"""
+    try:
+        st = os.stat(_database_path())
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+def _watch_customer_database(interval):
+    signature = _database_signature()
+    while True:
+        time.sleep(interval)
+        current = _database_signature()
+        if current is None or current == signature:
+            continue
+        signature = current
+        print("🔄 Customer database changed, rebuilding index")
+        try:
+            reload_customer_database()
+        except Exception as e:
+            print(f"❌ Customer database reload failed: {e}")
+
+def start_customer_db_watcher(interval=None):
+    """
+    Load the index now and keep it current from a background thread
+    
+    Polls the JSON file's mtime and size every `interval` seconds; on a
+    change the index is rebuilt off the request path and swapped in.
+    Safe to call more than once.
+    
+    Args:
+        interval (float): Poll period in seconds (default
+            CUSTOMER_DB_RELOAD_INTERVAL)
+        
+    Returns:
+        threading.Thread: The watcher thread
+    """
+    global _watcher_thread
+    with _customer_index_lock:
+        if _watcher_thread is not None:
+            return _watcher_thread
+        _watcher_thread = threading.Thread(
+            target=_watch_customer_database,
+            args=(interval or CUSTOMER_DB_RELOAD_INTERVAL,),
+            name='customer-db-watcher',
+            daemon=True,
+        )
+    get_customer_index()
+    _watcher_thread.start()
+    return _watcher_thread
+
 def get_customer_by_phone(phone_number):
     """
     Get customer information by phone number
@@ -31,17 +206,29 @@ def get_customer_by_phone(phone_number):
     Returns:
         dict: Customer information or None if not found
     """
-    customers = load_customer_database()
+    if _repository is not None:
+        return _repository.get_by_phone(phone_number)
     
-    # Normalize phone number (remove spaces, dashes, etc.)
-    normalized_search = phone_number.replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
+    key = normalize_phone(phone_number)
+    if not key:
+        return None
+    return get_customer_index().get(key)
+
+def get_customers_by_phones(phone_numbers):
+    """
+    Resolve many phone numbers in one pass over the index
     
-    for customer in customers:
-        normalized_customer = customer['phone_number'].replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
-        if normalized_customer == normalized_search:
-            return customer
+    Args:
+        phone_numbers (iterable): Phone numbers to search for
+        
+    Returns:
+        dict: Each input phone number -> customer information or None
+    """
+    if _repository is not None:
+        return _repository.get_by_phones(phone_numbers)
     
-    return None
+    index = get_customer_index()
+    return {phone: index.get(normalize_phone(phone)) for phone in phone_numbers}
 
 def get_customer_context(phone_number):
     """
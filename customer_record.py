@@ -0,0 +1,65 @@
+"""
+Compact Customer Record
+Slotted replacement for the 12-key customer dict held in the phone index
+
+Records keep the dict-style access the tools rely on (customer['plan'],
+customer.get('notes')) without a per-record hash table. Low-cardinality
+fields are interned so millions of records share one string per plan,
+location and sentiment. Use to_dict() (or dict(record)) at JSON boundaries.
+"""
+
+import sys
+from customer_repository import CUSTOMER_FIELDS
+
+_INTERNED_FIELDS = frozenset(('plan', 'location', 'previous_sentiment'))
+
+
+class CustomerRecord:
+    """Customer record with fixed fields and dict-style read access"""
+
+    __slots__ = CUSTOMER_FIELDS
+
+    def __init__(self, **fields):
+        for field in CUSTOMER_FIELDS:
+            value = fields.get(field)
+            if field in _INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, field, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a customer dict (unknown keys are ignored)"""
+        return cls(**data)
+
+    def to_dict(self):
+        """Plain dict view for JSON serialization"""
+        return {field: getattr(self, field) for field in CUSTOMER_FIELDS}
+
+    def __getitem__(self, key):
+        if key not in CUSTOMER_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in CUSTOMER_FIELDS:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return CUSTOMER_FIELDS
+
+    def __iter__(self):
+        return iter(CUSTOMER_FIELDS)
+
+    def __contains__(self, key):
+        return key in CUSTOMER_FIELDS
+
+    def __eq__(self, other):
+        if isinstance(other, CustomerRecord):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CustomerRecord(phone_number={self.phone_number!r}, name={self.name!r})"
@@ -0,0 +1,192 @@
+"""
+SQLite Customer Repository
+On-disk customer store shared by the voice bot and the CSR dashboard
+
+Rows are indexed on canonical phone, account_id and email, so lookups stay
+O(log n) without loading the customer set into memory. Each thread gets its
+own connection; queries use fixed SQL strings so sqlite3's per-connection
+statement cache keeps them prepared.
+
+Usage:
+    python customer_repository.py import customer_database.json customers.sqlite3
+"""
+
+import json
+import sys
+
+from sqlite_connections import ThreadLocalConnection
+
+CUSTOMER_FIELDS = (
+    'phone_number', 'name', 'email', 'account_id', 'plan', 'monthly_bill',
+    'account_age_months', 'previous_calls', 'last_call_date',
+    'previous_sentiment', 'notes', 'location',
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+    phone_key TEXT PRIMARY KEY,
+    phone_number TEXT NOT NULL,
+    name TEXT,
+    email TEXT,
+    account_id TEXT,
+    plan TEXT,
+    monthly_bill REAL,
+    account_age_months INTEGER,
+    previous_calls INTEGER,
+    last_call_date TEXT,
+    previous_sentiment TEXT,
+    notes TEXT,
+    location TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_customers_account_id ON customers(account_id);
+CREATE INDEX IF NOT EXISTS idx_customers_email ON customers(email);
+"""
+
+_COLUMNS = ', '.join(CUSTOMER_FIELDS)
+_SELECT_BY_PHONE = f"SELECT {_COLUMNS} FROM customers WHERE phone_key = ?"
+_SELECT_BY_ACCOUNT = f"SELECT {_COLUMNS} FROM customers WHERE account_id = ? LIMIT 1"
+_SELECT_BY_EMAIL = f"SELECT {_COLUMNS} FROM customers WHERE email = ? LIMIT 1"
+_UPSERT = (
+    f"INSERT OR REPLACE INTO customers (phone_key, {_COLUMNS}) "
+    f"VALUES ({', '.join('?' * (len(CUSTOMER_FIELDS) + 1))})"
+)
+_COUNT = "SELECT COUNT(*) FROM customers"
+
+# Stay under SQLite's default bound-parameter limit (999 on older builds)
+_IN_BATCH = 900
+
+
+def normalize_phone(phone_number):
+    """
+    Canonical phone key used by every customer index
+
+    Strips everything but digits and prefixes 10-digit US numbers with the
+    country code, so "+1 (720) 686-6656", "720-686-6656" and "17206866656"
+    all map to the same key.
+
+    Args:
+        phone_number (str): Phone number in any common format
+
+    Returns:
+        str: Canonical digits-only key ('' if no digits)
+    """
+    if not phone_number:
+        return ''
+    digits = ''.join(c for c in phone_number if c.isdigit())
+    if len(digits) == 10:
+        digits = '1' + digits
+    return digits
+
+
+class SQLiteCustomerRepository:
+    """Customer store backed by an on-disk SQLite database"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._connection = ThreadLocalConnection(db_path, cached_statements=64)
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _row_to_customer(row):
+        return dict(zip(CUSTOMER_FIELDS, row)) if row else None
+
+    @staticmethod
+    def _customer_to_row(customer):
+        return (normalize_phone(customer['phone_number']),) + tuple(
+            customer.get(field) for field in CUSTOMER_FIELDS
+        )
+
+    def get_by_phone(self, phone_number: str):
+        """Get a customer by phone number in any format"""
+        key = normalize_phone(phone_number)
+        if not key:
+            return None
+        row = self._connection().execute(_SELECT_BY_PHONE, (key,)).fetchone()
+        return self._row_to_customer(row)
+
+    def get_by_phones(self, phone_numbers):
+        """
+        Resolve many phone numbers with one IN query per 900 numbers
+
+        Args:
+            phone_numbers (iterable): Phone numbers in any format
+
+        Returns:
+            dict: Each input phone number -> customer dict or None
+        """
+        phone_numbers = list(phone_numbers)
+        keys = {normalize_phone(phone) for phone in phone_numbers}
+        keys.discard('')
+        keys = list(keys)
+
+        found = {}
+        conn = self._connection()
+        for i in range(0, len(keys), _IN_BATCH):
+            chunk = keys[i:i + _IN_BATCH]
+            sql = (
+                f"SELECT phone_key, {_COLUMNS} FROM customers "
+                f"WHERE phone_key IN ({', '.join('?' * len(chunk))})"
+            )
+            for row in conn.execute(sql, chunk):
+                found[row[0]] = self._row_to_customer(row[1:])
+        return {phone: found.get(normalize_phone(phone)) for phone in phone_numbers}
+
+    def get_by_account_id(self, account_id: str):
+        """Get a customer by account ID"""
+        row = self._connection().execute(_SELECT_BY_ACCOUNT, (account_id,)).fetchone()
+        return self._row_to_customer(row)
+
+    def get_by_email(self, email: str):
+        """Get a customer by email address"""
+        row = self._connection().execute(_SELECT_BY_EMAIL, (email,)).fetchone()
+        return self._row_to_customer(row)
+
+    def upsert(self, customer: dict):
+        """Insert or replace a single customer record"""
+        conn = self._connection()
+        with conn:
+            conn.execute(_UPSERT, self._customer_to_row(customer))
+
+    def bulk_upsert(self, customers, batch_size: int = 10_000) -> int:
+        """Insert or replace many customers in batched transactions"""
+        conn = self._connection()
+        total = 0
+        batch = []
+        for customer in customers:
+            batch.append(self._customer_to_row(customer))
+            if len(batch) >= batch_size:
+                with conn:
+                    conn.executemany(_UPSERT, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            with conn:
+                conn.executemany(_UPSERT, batch)
+            total += len(batch)
+        return total
+
+    def count(self) -> int:
+        """Number of customers stored"""
+        return self._connection().execute(_COUNT).fetchone()[0]
+
+    def close(self):
+        """Close this thread's connection"""
+        self._connection.close()
+
+
+def import_json(json_path, db_path):
+    """Import a customer_database.json export into a SQLite repository"""
+    with open(json_path, 'r') as f:
+        customers = json.load(f)
+    repo = SQLiteCustomerRepository(db_path)
+    return repo.bulk_upsert(customers)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == 'import':
+        count = import_json(sys.argv[2], sys.argv[3])
+        print(f"✅ Imported {count} customers into {sys.argv[3]}")
+    else:
+        print("Usage: python customer_repository.py import <customers.json> <db.sqlite3>")
+        sys.exit(1)
@@ -0,0 +1,177 @@
+"""
+Customer Snapshot Module
+Streaming JSON loader and memory-mapped binary snapshot for the customer index
+
+The JSON loader decodes customer_database.json one record at a time, so the
+index builder never sees the whole list at once. The snapshot stores the
+index as a sorted key array plus compact JSON records; later startups mmap it
+and are ready to serve immediately, decoding only the records that are hit.
+
+Snapshot layout (little-endian):
+    header   8s magic, Q count
+    keys     count x Q   canonical phone keys, sorted
+    offsets  count x Q   record offsets into the data section
+    lengths  count x I   record byte lengths
+    data     compact JSON records
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+
+from customer_record import CustomerRecord
+
+SNAPSHOT_MAGIC = b'CUSTSNP2'  # v1 files could silently be missing customers
+_HEADER = struct.Struct('<8sQ')
+_CHUNK_SIZE = 1 << 16
+_NUMBER_CHARS = frozenset('0123456789+-.eE')
+
+
+def iter_json_array(path, chunk_size=_CHUNK_SIZE):
+    """
+    Yield the objects of a top-level JSON array without loading it whole
+
+    Args:
+        path (str): Path to a file containing a JSON array
+        chunk_size (int): Bytes read from disk per refill
+
+    Yields:
+        Decoded array elements, in file order
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r') as f:
+        buf = f.read(chunk_size)
+        pos = _skip_ws(buf, 0)
+        if pos >= len(buf) or buf[pos] != '[':
+            raise ValueError(f"{path} does not contain a JSON array")
+        pos += 1
+        eof = False
+        while True:
+            pos = _skip_ws(buf, pos)
+            if pos < len(buf) and buf[pos] == ']':
+                return
+            if pos < len(buf) and buf[pos] == ',':
+                pos = _skip_ws(buf, pos + 1)
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+                # A number cut by the chunk boundary ("123|45", "1.5e|10") still
+                # decodes, so only trust it once a delimiter follows
+                complete = eof or (end < len(buf) and buf[end] not in _NUMBER_CHARS)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                # Record straddles the chunk boundary; pull in more text
+                more = f.read(chunk_size)
+                eof = not more
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+            yield item
+            pos = end
+            # Drop consumed text so the buffer stays around one chunk
+            if pos > chunk_size:
+                buf = buf[pos:]
+                pos = 0
+
+
+def _skip_ws(buf, pos):
+    while pos < len(buf) and buf[pos] in ' \t\r\n':
+        pos += 1
+    return pos
+
+
+def _numeric_key(key):
+    """Snapshot keys are stored as uint64; None if a key can't round-trip"""
+    if not key or not key.isdigit() or key[0] == '0' or len(key) > 19:
+        return None
+    return int(key)
+
+
+def write_snapshot(index, path):
+    """
+    Write a customer index to a binary snapshot (atomically)
+
+    Args:
+        index (dict): Canonical phone key -> customer record (dict or any
+            mapping-like record such as CustomerRecord)
+        path (str): Snapshot file to create or replace
+
+    Raises:
+        ValueError: Some key can't be stored as a uint64 (leading zero or
+            over 19 digits); no snapshot is written, since it would lose
+            those customers
+    """
+    unencodable = [k for k in index if _numeric_key(k) is None]
+    if unencodable:
+        raise ValueError(f"{len(unencodable)} customer key(s) can't be stored in a snapshot, e.g. {unencodable[0]!r}")
+    keys = sorted((_numeric_key(k), k) for k in index)
+    count = len(keys)
+    offsets = []
+    lengths = []
+    records = []
+    offset = 0
+    for _, key in keys:
+        blob = json.dumps(dict(index[key]), separators=(',', ':')).encode('utf-8')
+        offsets.append(offset)
+        lengths.append(len(blob))
+        records.append(blob)
+        offset += len(blob)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, count))
+        f.write(struct.pack(f'<{count}Q', *(numeric for numeric, _ in keys)))
+        f.write(struct.pack(f'<{count}Q', *offsets))
+        f.write(struct.pack(f'<{count}I', *lengths))
+        for blob in records:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class SnapshotIndex:
+    """Read-only, memory-mapped customer index with a dict-like get()"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC or sys.byteorder != 'little':
+            self._mm.close()
+            raise ValueError(f"{path} is not a customer snapshot")
+        self._count = count
+        # memoryview casts use native byte order; snapshots are little-endian
+        view = memoryview(self._mm)
+        start = _HEADER.size
+        self._keys = view[start:start + 8 * count].cast('Q')
+        start += 8 * count
+        self._offsets = view[start:start + 8 * count].cast('Q')
+        start += 8 * count
+        self._lengths = view[start:start + 4 * count].cast('I')
+        self._data_start = start + 4 * count
+        self._view = view
+
+    def __len__(self):
+        return self._count
+
+    def get(self, key, default=None):
+        """Look up a canonical phone key; decodes only the matching record into a CustomerRecord"""
+        numeric = _numeric_key(key)
+        if numeric is None:
+            return default
+        i = bisect.bisect_left(self._keys, numeric)
+        if i == self._count or self._keys[i] != numeric:
+            return default
+        start = self._data_start + self._offsets[i]
+        return CustomerRecord.from_dict(json.loads(self._mm[start:start + self._lengths[i]]))
+
+    def close(self):
+        """Release the memory map"""
+        for view in (self._keys, self._offsets, self._lengths, self._view):
+            view.release()
+        self._mm.close()
@@ -0,0 +1,120 @@
+"""
+HTTP Connection Pools
+Keep-alive transports for the OpenRouter and Twilio clients, with warm-up
+pings and connection reuse metrics
+"""
+
+import threading
+import time
+
+import httpx
+from requests.adapters import HTTPAdapter
+from twilio.http.http_client import TwilioHttpClient
+
+KEEPALIVE_EXPIRY_SECONDS = 90
+
+
+class ConnectionStats:
+    """Request, new-connection and TLS handshake counters for one client"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+
+    def _add(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            reused = max(0, self.requests - self.new_connections)
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'tls_handshakes': self.tls_handshakes,
+                'reused_connections': reused,
+                'reuse_rate': reused / self.requests if self.requests else 0.0,
+            }
+
+
+def build_openrouter_http_client(pool_size, stats, timeout=30.0):
+    """
+    httpx client for the OpenAI SDK with a keep-alive pool of `pool_size`
+
+    Connection setup is counted through httpcore's trace extension.
+    """
+    def trace(event_name, info):
+        if event_name == 'connection.connect_tcp.complete':
+            stats._add('new_connections')
+        elif event_name == 'connection.start_tls.complete':
+            stats._add('tls_handshakes')
+
+    def on_request(request):
+        stats._add('requests')
+        request.extensions['trace'] = trace
+
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=timeout,
+        event_hooks={'request': [on_request]},
+    )
+
+
+def build_twilio_http_client(pool_size):
+    """Twilio HTTP client whose requests session keeps `pool_size` connections per host"""
+    http_client = TwilioHttpClient(pool_connections=True)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    http_client.session.mount('https://', adapter)
+    return http_client
+
+
+def twilio_connection_stats(http_client):
+    """Connection counters read from the urllib3 pools behind a Twilio client"""
+    adapter = http_client.session.get_adapter('https://api.twilio.com')
+    requests_made = new_connections = 0
+    for key in list(adapter.poolmanager.pools.keys()):
+        pool = adapter.poolmanager.pools.get(key)
+        if pool is None:
+            continue
+        requests_made += pool.num_requests
+        new_connections += pool.num_connections
+    reused = max(0, requests_made - new_connections)
+    return {
+        'requests': requests_made,
+        'new_connections': new_connections,
+        'tls_handshakes': new_connections,  # every new HTTPS connection handshakes
+        'reused_connections': reused,
+        'reuse_rate': reused / requests_made if requests_made else 0.0,
+    }
+
+
+def start_connection_warmer(pings, interval):
+    """
+    Ping each upstream now and every `interval` seconds so idle keep-alive
+    connections don't expire between calls
+
+    Args:
+        pings (dict): name -> zero-arg callable issuing a cheap request
+        interval (float): Seconds between pings (keep below the keep-alive expiry)
+
+    Returns:
+        threading.Thread: The warmer thread
+    """
+    def warm():
+        while True:
+            for name, ping in pings.items():
+                try:
+                    ping()
+                except Exception as e:
+                    print(f"⚠️ Connection warm-up to {name} failed: {e}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=warm, name='http-warmer', daemon=True)
+    thread.start()
+    return thread
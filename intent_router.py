@@ -0,0 +1,226 @@
+"""
+Intent Router
+Local classifier that maps simple caller requests straight to a tool
+
+High-precision regexes catch the common phrasings; a small multinomial
+naive Bayes model (linear in log space) scores everything else, but only
+picks an intent whose domain keywords appear in the utterance. Only
+utterances classified with confidence >= CONFIDENCE_THRESHOLD skip the LLM.
+Trouble reports, payment actions and questions about a plan other than the
+caller's always go to the LLM.
+"""
+
+import math
+import re
+from collections import Counter, namedtuple
+
+from tools import PLAN_CATALOG
+
+CONFIDENCE_THRESHOLD = 0.8
+REGEX_CONFIDENCE = 0.95
+
+IntentMatch = namedtuple('IntentMatch', ['intent', 'confidence', 'source'])
+
+# Phrasings that map unambiguously to one read-only tool
+INTENT_PATTERNS = {
+    'check_bill': re.compile(
+        r"\b(my|the) (monthly )?bill\b|\bhow much (do|did) i (owe|pay)\b|\bamount due\b"
+        r"|\bwhen is (my )?(bill|payment) due\b|\bbalance\b"
+    ),
+    'check_plan': re.compile(
+        r"\b(what|which) plan\b|\bplan (am i|i'm|i am) on\b|\bmy (current )?plan\b|\bplan details\b"
+    ),
+    'check_data_usage': re.compile(
+        r"\bdata (usage|used|left|remaining)\b|\bhow much data\b|\bused .{0,20}\bdata\b"
+    ),
+    # "upgrade" alone may mean a plan change, so a device word is required
+    'get_upgrade_eligibility': re.compile(
+        r"\bupgrade\b.{0,30}\b(phone|iphone|device)\b|\b(phone|iphone|device)\b.{0,30}\bupgrade\b"
+        r"|\bnew (phone|iphone|device)\b"
+    ),
+}
+
+# The model may only pick an intent if one of its domain words is present,
+# so filler like "is the network ok" can't win on stopwords alone
+INTENT_KEYWORDS = {
+    'check_bill': re.compile(r"\b(bill\w*|owe|pay\w*|due|balance)\b"),
+    'check_plan': re.compile(r"\b(plan|features?|includ\w*)\b"),
+    'check_data_usage': re.compile(r"\b(data|gigs?|gigabytes?|usage)\b"),
+    'get_upgrade_eligibility': re.compile(r"\b(phone|iphone|device|samsung|pixel|galaxy)\b"),
+}
+
+# Words that turn a lookup into a request the LLM should handle: complaints
+# and changes ("why is my bill so high", "change my plan", "upgrade my
+# plan", "add a line"), advice ("what plan should I get"), negations and
+# trouble reports ("my data isn't working"), and payment actions
+# ("how do I pay my bill") that a balance readout doesn't answer
+_ESCALATION = re.compile(
+    r"\b(why|wrong|cancel|change|switch|dispute|lower|reduce|refund|complain|charged twice|overcharg\w*)\b"
+    r"|\bupgrade\b.{0,20}\bplan\b|\bplan upgrade\b|\b(add|adding|lines?)\b"
+    r"|\b(should|recommend\w*|suggest\w*|best|better)\b"
+    r"|\b(not|never|cannot|no longer)\b|\w+n['’]t\b"
+    r"|\b(working|broken|broke|stopped|dead|outage|error)\b"
+    r"|\bpay (my|the|this|that|it|online|now|off)\b|\bhow (do|can|should) i pay\b"
+    r"|\bmake a payment\b|\bautopay\b|\bpayment (method|option)s?\b"
+)
+
+# Catalog plan names as spoken ("go 5g plus"), longest first so "Magenta Max"
+# isn't read as "Magenta"
+_PLAN_NAMES = sorted(PLAN_CATALOG, key=len, reverse=True)
+_PLAN_MENTION = re.compile(
+    r"\b(" + "|".join(
+        r"\s*".join(re.escape(part) for part in re.split(r"(?<=[a-z])(?=\d)|\s+", name.lower()))
+        for name in _PLAN_NAMES
+    ) + r")\b"
+)
+
+# Seed data for the linear model; 'other' means "let the LLM answer"
+INTENT_TRAINING_DATA = [
+    ("what's my bill", 'check_bill'),
+    ("how much is my bill this month", 'check_bill'),
+    ("how much do i owe", 'check_bill'),
+    ("when is my payment due", 'check_bill'),
+    ("what do i owe you guys", 'check_bill'),
+    ("tell me my bill amount", 'check_bill'),
+    ("what is the due date", 'check_bill'),
+    ("what am i paying per month", 'check_bill'),
+    ("what plan am i on", 'check_plan'),
+    ("which plan do i have", 'check_plan'),
+    ("tell me about my plan", 'check_plan'),
+    ("what does my plan include", 'check_plan'),
+    ("what features come with my plan", 'check_plan'),
+    ("what's my current plan", 'check_plan'),
+    ("how much data have i used", 'check_data_usage'),
+    ("what's my data usage", 'check_data_usage'),
+    ("how much data do i have left", 'check_data_usage'),
+    ("am i close to my data limit", 'check_data_usage'),
+    ("how many gigabytes have i used", 'check_data_usage'),
+    ("check my data", 'check_data_usage'),
+    ("can i upgrade my phone", 'get_upgrade_eligibility'),
+    ("am i eligible for an upgrade", 'get_upgrade_eligibility'),
+    ("i want a new phone", 'get_upgrade_eligibility'),
+    ("when can i get a new iphone", 'get_upgrade_eligibility'),
+    ("is my phone due for an upgrade", 'get_upgrade_eligibility'),
+    ("my internet is slow", 'other'),
+    ("i have no signal at home", 'other'),
+    ("i want to cancel my service", 'other'),
+    ("why is my bill so high", 'other'),
+    ("i want to change my plan", 'other'),
+    ("hello", 'other'),
+    ("thank you that's all", 'other'),
+    ("can you help me", 'other'),
+    ("my phone keeps dropping calls", 'other'),
+    ("i was charged twice", 'other'),
+    ("how do i set up voicemail", 'other'),
+    ("what's the weather like", 'other'),
+    ("i need to update my address", 'other'),
+    ("is there an outage in my area", 'other'),
+    ("is the network ok", 'other'),
+    ("what time is it", 'other'),
+    ("where is the nearest store", 'other'),
+    ("are you a robot", 'other'),
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def _features(text):
+    """Unigrams plus bigrams of a lowercased utterance"""
+    tokens = _TOKEN_RE.findall(text.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class LinearIntentModel:
+    """Multinomial naive Bayes over unigram and bigram counts"""
+
+    def __init__(self, alpha=0.5):
+        self.alpha = alpha
+        self.classes = []
+        self._log_prior = {}
+        self._log_likelihood = {}
+        self._log_unseen = {}
+
+    def fit(self, examples):
+        """Train on (utterance, label) pairs"""
+        counts = {}
+        class_totals = Counter()
+        vocab = set()
+        for text, label in examples:
+            features = _features(text)
+            counts.setdefault(label, Counter()).update(features)
+            class_totals[label] += 1
+            vocab.update(features)
+
+        self.classes = sorted(counts)
+        total = sum(class_totals.values())
+        for label in self.classes:
+            self._log_prior[label] = math.log(class_totals[label] / total)
+            denom = sum(counts[label].values()) + self.alpha * (len(vocab) + 1)
+            self._log_likelihood[label] = {
+                feature: math.log((n + self.alpha) / denom) for feature, n in counts[label].items()
+            }
+            self._log_unseen[label] = math.log(self.alpha / denom)
+        return self
+
+    def predict_proba(self, text):
+        """Return {label: probability} for an utterance"""
+        features = _features(text)
+        scores = {}
+        for label in self.classes:
+            likelihood = self._log_likelihood[label]
+            unseen = self._log_unseen[label]
+            scores[label] = self._log_prior[label] + sum(likelihood.get(f, unseen) for f in features)
+        top = max(scores.values())
+        exp_scores = {label: math.exp(score - top) for label, score in scores.items()}
+        norm = sum(exp_scores.values())
+        return {label: value / norm for label, value in exp_scores.items()}
+
+
+_model = LinearIntentModel().fit(INTENT_TRAINING_DATA)
+
+
+def _mentioned_plans(lowered):
+    """Catalog plan names mentioned in a lowercased utterance"""
+    return {re.sub(r"\s+", "", match.group(1)) for match in _PLAN_MENTION.finditer(lowered)}
+
+
+def classify_intent(text, customer_plan=None):
+    """
+    Classify a caller utterance
+
+    Args:
+        text (str): What the caller said
+        customer_plan (str): The caller's plan name, if known
+
+    Returns:
+        IntentMatch: intent is a tool name, or None if the LLM should handle it
+    """
+    lowered = text.lower()
+    if _ESCALATION.search(lowered):
+        return IntentMatch(None, 0.0, 'escalation')
+
+    # Asking about some other plan - the caller's own plan isn't the answer
+    own_plan = re.sub(r"\s+", "", customer_plan.lower()) if customer_plan else None
+    if any(plan != own_plan for plan in _mentioned_plans(lowered)):
+        return IntentMatch(None, 0.0, 'other_plan')
+
+    matched = [intent for intent, pattern in INTENT_PATTERNS.items() if pattern.search(lowered)]
+    if len(matched) == 1:
+        return IntentMatch(matched[0], REGEX_CONFIDENCE, 'regex')
+    if len(matched) > 1:
+        # Asked about several things at once; let the model plan tool calls
+        return IntentMatch(None, 0.0, 'ambiguous')
+
+    probabilities = _model.predict_proba(lowered)
+    intent = max(probabilities, key=probabilities.get)
+    if intent == 'other' or not INTENT_KEYWORDS[intent].search(lowered):
+        return IntentMatch(None, probabilities['other'], 'model')
+    return IntentMatch(intent, probabilities[intent], 'model')
+
+
+def route_intent(text, threshold=CONFIDENCE_THRESHOLD, customer_plan=None):
+    """Tool to answer with directly, or None if confidence is too low"""
+    match = classify_intent(text, customer_plan)
+    if match.intent is not None and match.confidence >= threshold:
+        return match.intent
+    return None
@@ -0,0 +1,208 @@
+"""
+Job Queue
+Persistent background jobs in a SQLite file, run by a bounded worker pool
+
+Jobs survive restarts and can be shared by several gunicorn workers: a job
+is claimed inside an IMMEDIATE transaction and leased, so a worker that dies
+mid-job only delays it until the lease runs out. Each job has an
+idempotency key (e.g. a RecordingSid); enqueueing the same key twice is a
+no-op, so retried webhooks don't run the work again.
+"""
+
+import json
+import threading
+import time
+import traceback
+
+from sqlite_connections import ThreadLocalConnection
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_SECONDS = 5.0
+DEFAULT_LEASE_SECONDS = 15 * 60
+DEFAULT_POLL_SECONDS = 1.0
+LATENCY_WINDOW = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_after REAL NOT NULL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_run_after ON jobs(status, run_after);
+"""
+
+_CLAIM = (
+    "SELECT id, kind, payload, attempts, enqueued_at FROM jobs "
+    "WHERE (status = 'queued' AND run_after <= ?) OR (status = 'running' AND run_after <= ?) "
+    "ORDER BY run_after LIMIT 1"
+)
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue with retries
+
+    Args:
+        db_path (str): SQLite file holding the jobs
+        handlers (dict): kind -> fn(**payload); raising marks the attempt failed
+        workers (int): Worker threads in this process
+        max_attempts (int): Attempts before a job is marked failed
+        backoff (float): Retry delay in seconds, doubled after each failure
+        lease (float): Seconds a running job is reserved for its worker
+    """
+
+    def __init__(self, db_path, handlers, workers=DEFAULT_WORKERS, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 backoff=DEFAULT_BACKOFF_SECONDS, lease=DEFAULT_LEASE_SECONDS, poll_interval=DEFAULT_POLL_SECONDS):
+        self.db_path = db_path
+        self.handlers = dict(handlers)
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        # Autocommit; _claim() opens its own IMMEDIATE transaction
+        self._connection = ThreadLocalConnection(db_path, isolation_level=None, timeout=5.0)
+        self._wakeup = threading.Event()
+        self._threads = []
+        self._stats_lock = threading.Lock()
+        self._latencies = []  # (queue wait, total) seconds of recent completed jobs
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+        self._connection().executescript(_SCHEMA)
+
+    def enqueue(self, kind, payload, idempotency_key):
+        """
+        Add a job unless one with this key already exists
+
+        Returns:
+            bool: True if the job was added, False if it was a duplicate
+        """
+        now = time.time()
+        cursor = self._connection().execute(
+            "INSERT OR IGNORE INTO jobs (kind, idempotency_key, payload, run_after, enqueued_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (kind, idempotency_key, json.dumps(payload), now, now)
+        )
+        if cursor.rowcount:
+            self._wakeup.set()
+            return True
+        return False
+
+    def _claim(self):
+        """Lease the next runnable job, or return None"""
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(_CLAIM, (now, now)).fetchone()
+            if row is not None:
+                # For running jobs run_after holds the lease expiry
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, run_after = ? "
+                    "WHERE id = ?",
+                    (now, now + self.lease, row[0])
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def run_next(self):
+        """Run one job if any is due; returns True if a job was run"""
+        row = self._claim()
+        if row is None:
+            return False
+        job_id, kind, payload, attempts, enqueued_at = row
+        attempts += 1
+        started = time.time()
+        conn = self._connection()
+        try:
+            self.handlers[kind](**json.loads(payload))
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if attempts >= self.max_attempts:
+                print(f"❌ Job {kind} #{job_id} failed after {attempts} attempts: {error}")
+                traceback.print_exc()
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', finished_at = ?, last_error = ? WHERE id = ?",
+                    (time.time(), error, job_id)
+                )
+                with self._stats_lock:
+                    self.failed += 1
+            else:
+                delay = self.backoff * (2 ** (attempts - 1))
+                print(f"🔁 Job {kind} #{job_id} failed ({error}), retry {attempts + 1} in {delay:.0f}s")
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', run_after = ?, last_error = ? WHERE id = ?",
+                    (time.time() + delay, error, job_id)
+                )
+                with self._stats_lock:
+                    self.retried += 1
+            return True
+
+        finished = time.time()
+        conn.execute("UPDATE jobs SET status = 'done', finished_at = ? WHERE id = ?", (finished, job_id))
+        with self._stats_lock:
+            self.completed += 1
+            self._latencies.append((started - enqueued_at, finished - enqueued_at))
+            del self._latencies[:-LATENCY_WINDOW]
+        return True
+
+    def _work(self):
+        while True:
+            try:
+                if self.run_next():
+                    continue
+            except Exception as e:
+                print(f"⚠️ Job worker error: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, name=f'job-worker-{len(self._threads)}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stats(self):
+        """Queue depth by status, oldest waiting job and recent job latencies"""
+        conn = self._connection()
+        depth = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        oldest = conn.execute("SELECT MIN(enqueued_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        with self._stats_lock:
+            latencies = list(self._latencies)
+            counters = {'completed': self.completed, 'retried': self.retried, 'failed': self.failed}
+
+        def percentile(values, p):
+            if not values:
+                return None
+            values = sorted(values)
+            return round(values[min(len(values) - 1, int(p / 100 * len(values)))], 3)
+
+        waits = [wait for wait, _ in latencies]
+        totals = [total for _, total in latencies]
+        return {
+            'queued': depth.get('queued', 0),
+            'running': depth.get('running', 0),
+            'done': depth.get('done', 0),
+            'failed': depth.get('failed', 0),
+            'oldest_queued_age_seconds': round(time.time() - oldest, 3) if oldest else None,
+            'queue_wait_p50_seconds': percentile(waits, 50),
+            'queue_wait_p95_seconds': percentile(waits, 95),
+            'job_latency_p50_seconds': percentile(totals, 50),
+            'job_latency_p95_seconds': percentile(totals, 95),
+            'workers': len(self._threads),
+            **counters,
+        }
@@ -0,0 +1,204 @@
+"""
+LLM Hedging
+Deadline-bounded requests that fire a hedged duplicate when the first one is slow
+
+The primary attempt starts immediately. If it hasn't produced an answer by
+the hedge delay (a percentile of recent answer latencies), a hedge attempt
+starts too. Whichever claims the race first wins and the other is cancelled.
+If nothing has answered by the hard deadline, DeadlineExceeded is raised so
+the caller can say a filler line instead.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+DEFAULT_HEDGE_PERCENTILE = 90
+DEFAULT_HEDGE_DELAY = 1.5  # Used until enough latencies have been seen
+MIN_HEDGE_DELAY = 0.3
+MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+
+class DeadlineExceeded(Exception):
+    """No attempt answered before the hard deadline"""
+
+
+class HedgeRace:
+    """
+    Shared state for the attempts of one hedged request
+
+    An attempt calls claim() when it has something to say (its first spoken
+    chunk, or its finished result). The first claim wins; every other
+    attempt's cancel hooks run so its connection is closed.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.cond = threading.Condition()
+        self.winner = None
+        self.claimed_at = None
+        self._cancel_hooks = {}
+
+    def claim(self, attempt_id):
+        """Try to win the race; returns False if another attempt already won"""
+        with self.cond:
+            if self.winner is not None:
+                return self.winner == attempt_id
+            self.winner = attempt_id
+            self.claimed_at = self.clock()
+            losers = [hook for other, hooks in self._cancel_hooks.items() if other != attempt_id for hook in hooks]
+            self.cond.notify_all()
+        for hook in losers:
+            _run_hook(hook)
+        return True
+
+    def lost(self, attempt_id):
+        """True once a different attempt has won"""
+        return self.winner is not None and self.winner != attempt_id
+
+    def on_cancel(self, attempt_id, hook):
+        """Run hook (e.g. stream.close) if this attempt loses"""
+        with self.cond:
+            if not self.lost(attempt_id):
+                self._cancel_hooks.setdefault(attempt_id, []).append(hook)
+                return
+        _run_hook(hook)
+
+    def cancel_all(self):
+        """Cancel every attempt (used when the hard deadline passes)"""
+        with self.cond:
+            self.winner = -1
+            hooks = [hook for hooks in self._cancel_hooks.values() for hook in hooks]
+        for hook in hooks:
+            _run_hook(hook)
+
+
+def _run_hook(hook):
+    try:
+        hook()
+    except Exception:
+        pass
+
+
+class HedgedRequester:
+    """
+    Runs hedged requests on an executor and tracks answer latencies
+
+    Args:
+        executor: Pool the attempts run on (must not be the caller's own pool)
+        percentile (float): Latency percentile used as the hedge delay
+        default_delay (float): Hedge delay until min_samples latencies are known
+        min_delay (float): Never hedge sooner than this
+    """
+
+    def __init__(self, executor, percentile=DEFAULT_HEDGE_PERCENTILE, default_delay=DEFAULT_HEDGE_DELAY,
+                 min_delay=MIN_HEDGE_DELAY, min_samples=MIN_SAMPLES, window=LATENCY_WINDOW,
+                 clock=time.monotonic):
+        self.executor = executor
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.clock = clock
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges_fired = 0
+        self.hedge_wins = 0
+        self.deadline_misses = 0
+
+    def hedge_delay(self):
+        """Seconds to wait on the primary before firing the hedge"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        rank = max(0, math.ceil(self.percentile / 100 * len(samples)) - 1)
+        return max(self.min_delay, samples[rank])
+
+    def run(self, primary, hedge, deadline):
+        """
+        Run primary, hedging with `hedge` if it is slow
+
+        Args:
+            primary (callable): fn(race, attempt_id) -> result; should call
+                race.claim(attempt_id) before speaking and stop once
+                race.lost(attempt_id) is true
+            hedge (callable): Same signature; the duplicate request
+            deadline (float): Absolute clock time by which some attempt must claim
+
+        Returns:
+            The winning attempt's result
+
+        Raises:
+            DeadlineExceeded: Nothing answered before the deadline
+        """
+        race = HedgeRace(self.clock)
+        attempts = [primary, hedge]
+        started = {}
+        futures = {}
+
+        def launch(attempt_id):
+            started[attempt_id] = self.clock()
+            futures[attempt_id] = self.executor.submit(self._attempt, race, attempts[attempt_id], attempt_id)
+
+        with self._lock:
+            self.requests += 1
+        hedge_at = self.clock() + self.hedge_delay()
+        launch(0)
+
+        with race.cond:
+            while race.winner is None:
+                now = self.clock()
+                all_done = all(future.done() for future in futures.values())
+                if len(futures) == 1 and (now >= hedge_at or all_done):
+                    with self._lock:
+                        self.hedges_fired += 1
+                    launch(1)
+                    continue
+                if all_done:
+                    # Every attempt failed without answering
+                    return futures[0].result()
+                if now >= deadline:
+                    break
+                next_event = deadline if len(futures) > 1 else min(deadline, hedge_at)
+                race.cond.wait(timeout=max(0.0, next_event - now))
+
+        if race.winner is None:
+            race.cancel_all()
+            with self._lock:
+                self.deadline_misses += 1
+            raise DeadlineExceeded(f"no answer within {deadline - min(started.values()):.1f}s")
+
+        winner = race.winner
+        with self._lock:
+            self._latencies.append(race.claimed_at - started[winner])
+            if winner == 1:
+                self.hedge_wins += 1
+        return futures[winner].result()
+
+    @staticmethod
+    def _attempt(race, fn, attempt_id):
+        try:
+            result = fn(race, attempt_id)
+            race.claim(attempt_id)
+            return result
+        finally:
+            with race.cond:
+                race.cond.notify_all()
+
+    def stats(self):
+        """Hedge counters and the current hedge delay"""
+        with self._lock:
+            samples = len(self._latencies)
+            counters = {
+                'requests': self.requests,
+                'hedges_fired': self.hedges_fired,
+                'hedge_wins': self.hedge_wins,
+                'deadline_misses': self.deadline_misses,
+                'latency_samples': samples,
+            }
+        counters['hedge_delay_seconds'] = round(self.hedge_delay(), 3)
+        return counters
@@ -0,0 +1,116 @@
+"""
+Response Renderer
+Turns tool results into one spoken sentence without a model call
+"""
+
+from datetime import datetime
+
+
+def _money(amount):
+    """95.0 -> '95 dollars', 85.5 -> '85.50 dollars'"""
+    text = f"{amount:.2f}"
+    if text.endswith('.00'):
+        text = text[:-3]
+    return f"{text} dollars"
+
+
+def _date(iso_date):
+    """'2025-11-15' -> 'November 15'"""
+    try:
+        day = datetime.strptime(iso_date, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return iso_date
+    return f"{day.strftime('%B')} {day.day}"
+
+
+def _join(items):
+    items = list(items)
+    if len(items) <= 1:
+        return ''.join(items)
+    return f"{', '.join(items[:-1])} and {items[-1]}"
+
+
+def _render_check_bill(result):
+    return f"Your monthly bill is {_money(result['monthly_bill'])}, due on {_date(result['due_date'])}."
+
+
+def _render_check_plan(result):
+    # Every feature is read back: "does my plan include X" lands here too
+    features = [f for f in result['features'] if f != "Unlimited talk, text, data"]
+    sentence = f"You're on the {result['plan_name']} plan at {_money(result['monthly_cost'])} a month"
+    if len(features) < len(result['features']):
+        sentence += ", with unlimited talk, text and data"
+        if features:
+            sentence += f", plus {_join(features)}"
+    elif features:
+        sentence += f", with {_join(features)}"
+    return sentence + "."
+
+
+def _render_check_data_usage(result):
+    return (
+        f"You've used {result['data_used_gb']:g} gigabytes so far on your {result['data_limit'].lower()} plan, "
+        f"and your cycle ends {_date(result['billing_cycle_end'])}."
+    )
+
+
+def _render_get_upgrade_eligibility(result):
+    if not result['eligible']:
+        months = result['months_until_eligible']
+        return f"You'll be eligible for an upgrade in {months} month{'s' if months != 1 else ''}."
+    sentence = "Good news, you're eligible for an upgrade"
+    if result.get('upgrade_credit'):
+        sentence += f" with a {result['upgrade_credit']:g} dollar credit"
+    if result.get('available_upgrades'):
+        sentence += f", including the {_join(result['available_upgrades'])}"
+    return sentence + "."
+
+
+# Per-tool speech templates
+TOOL_TEMPLATES = {
+    'check_bill': _render_check_bill,
+    'check_plan': _render_check_plan,
+    'check_data_usage': _render_check_data_usage,
+    'get_upgrade_eligibility': _render_get_upgrade_eligibility,
+}
+
+
+def render_tool_response(tool_name, result):
+    """
+    Render a tool result as a spoken sentence
+
+    Args:
+        tool_name (str): Name of the tool that produced the result
+        result (dict): Result from the tool function
+
+    Returns:
+        str: Sentence to speak, or None if the tool has no template or the
+        result is an error (callers should fall back to the model)
+    """
+    template = TOOL_TEMPLATES.get(tool_name)
+    if template is None or not result or 'error' in result:
+        return None
+    try:
+        return template(result)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def render_tool_responses(tool_results):
+    """
+    Render the results of several tool calls as one spoken answer
+
+    Args:
+        tool_results (list): (tool_name, result) pairs
+
+    Returns:
+        str: Sentences joined in order, or None if any tool can't be
+        templated (the whole turn should then fall back to the model)
+    """
+    sentences = []
+    for tool_name, result in tool_results:
+        sentence = render_tool_response(tool_name, result)
+        if sentence is None:
+            return None
+        sentences.append(sentence)
+    return ' '.join(sentences) if sentences else None
@@ -0,0 +1,48 @@
+"""
+SQLite Connections
+Per-thread WAL-mode connections, shared by every SQLite-backed store
+
+sqlite3 connections can't be shared across threads, so each thread opens
+its own on first use and keeps it. WAL lets readers run alongside one
+writer, including across processes; synchronous=NORMAL is safe under WAL
+and skips an fsync per commit.
+
+Stdlib only: customer_repository.py (which uses this) is also loaded by
+path from the CSR dashboard.
+"""
+
+import sqlite3
+import threading
+
+
+class ThreadLocalConnection:
+    """
+    Callable returning this thread's connection to one SQLite file
+
+    Args:
+        db_path (str): SQLite file to open
+        **connect_kwargs: Passed to sqlite3.connect (isolation_level, timeout,
+            cached_statements, ...)
+    """
+
+    def __init__(self, db_path, **connect_kwargs):
+        self.db_path = db_path
+        self.connect_kwargs = connect_kwargs
+        self._local = threading.local()
+
+    def __call__(self):
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, **self.connect_kwargs)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close this thread's connection (reopened on next use)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,105 @@
+"""
+Tool Result Cache
+Bounded per-call cache for tool results with per-tool TTLs and LRU eviction
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# How long a tool result stays fresh (seconds); usage data changes mid-call
+DEFAULT_TOOL_TTLS = {
+    'check_data_usage': 60,
+    'check_network_status': 30,
+}
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class ToolResultCache:
+    """
+    Thread-safe tool result cache keyed by (call_sid, tool_name)
+
+    Entries expire after their tool's TTL, and the least recently used entry
+    is evicted once max_entries is reached. A call -> entries map makes
+    invalidating one call O(entries for that call) instead of O(all entries).
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttls=None,
+                 default_ttl=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TOOL_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # (call_sid, tool_name) -> (expires_at, result)
+        self._by_call = {}  # call_sid -> set of tool names
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, call_sid, tool_name):
+        """Return a fresh cached result, or None on a miss"""
+        key = (call_sid, tool_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, result = entry
+            if expires_at <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, call_sid, tool_name, result):
+        """Cache a result, evicting the least recently used entry if full"""
+        key = (call_sid, tool_name)
+        expires_at = self.clock() + self.ttls.get(tool_name, self.default_ttl)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                while len(self._entries) >= self.max_entries:
+                    self._remove(next(iter(self._entries)))
+                    self.evictions += 1
+                self._by_call.setdefault(call_sid, set()).add(tool_name)
+            self._entries[key] = (expires_at, result)
+
+    def invalidate_call(self, call_sid):
+        """Drop every entry for a call"""
+        with self._lock:
+            for tool_name in self._by_call.pop(call_sid, ()):
+                self._entries.pop((call_sid, tool_name), None)
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        call_sid, tool_name = key
+        tools = self._by_call.get(call_sid)
+        if tools is not None:
+            tools.discard(tool_name)
+            if not tools:
+                del self._by_call[call_sid]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'calls': len(self._by_call),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'expirations': self.expirations,
+                'evictions': self.evictions,
+            }
@@ -3,21 +3,135 @@ Tool Functions for Nemotron Agent
 These functions can be called by the AI based on customer requests
 """
 
+import asyncio
+import functools
+import inspect
 import json
+from collections import namedtuple
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from customer_db import get_customer_by_phone
 
-def check_bill(phone_number):
+# Plan catalog, built once at import and shared read-only by every call
+PlanInfo = namedtuple('PlanInfo', ['name', 'features', 'usage_percentage', 'price', 'summary'])
+
+PLAN_CATALOG = MappingProxyType({plan.name: plan for plan in (
+    PlanInfo("Unlimited Premium", ("Unlimited talk, text, data", "100GB premium data", "HD streaming", "International calling"), 65, 95, "100GB Premium + International"),
+    PlanInfo("Unlimited Plus", ("Unlimited talk, text, data", "50GB premium data", "SD streaming", "Mobile hotspot"), 72, 85, "50GB Premium + Hotspot"),
+    PlanInfo("Magenta Max", ("Unlimited talk, text, data", "Unlimited premium data", "4K streaming", "International data"), 58, 90, "Unlimited Premium + 4K"),
+    PlanInfo("Magenta", ("Unlimited talk, text, data", "100GB premium data", "HD streaming"), 80, 70, "HD Streaming"),
+    PlanInfo("Essentials", ("Unlimited talk, text, data", "Basic features only"), 45, 55, "Basic"),
+    PlanInfo("Go5G Plus", ("Unlimited talk, text, data", "100GB premium data", "Netflix included", "Apple TV+"), 68, 100, "Premium + Netflix + Apple TV+"),
+    PlanInfo("Go5G", ("Unlimited talk, text, data", "50GB premium data", "HD streaming"), 75, None, None),
+)})
+
+DEFAULT_FEATURES = ("Standard features",)
+DEFAULT_USAGE_PERCENTAGE = 50
+
+# Plans offered for sale, cheapest first (read-only; results get copies)
+AVAILABLE_PLANS = tuple(
+    MappingProxyType({"name": plan.name, "price": plan.price, "data": "Unlimited", "features": plan.summary})
+    for plan in sorted(PLAN_CATALOG.values(), key=lambda p: p.price or 0)
+    if plan.price is not None
+)
+
+def _json_fields(fields):
+    """Serialize a dict as a JSON object body (no braces) for splicing"""
+    return json.dumps(fields)[1:-1]
+
+# Pre-serialized static parts of tool results, keyed by plan name
+_PLAN_FRAGMENTS = {
+    name: _json_fields({
+        "features": list(plan.features),
+        "data_included": "Unlimited",
+        "contract_type": "No contract"
+    })
+    for name, plan in PLAN_CATALOG.items()
+}
+_DEFAULT_PLAN_FRAGMENT = _json_fields({
+    "features": list(DEFAULT_FEATURES),
+    "data_included": "Unlimited",
+    "contract_type": "No contract"
+})
+_AVAILABLE_PLANS_FRAGMENT = _json_fields({
+    "available_plans": [dict(plan) for plan in AVAILABLE_PLANS],
+    "can_upgrade": True,
+    "can_downgrade": True
+})
+
+def _usage_fields(plan_name):
+    usage_pct = PLAN_CATALOG[plan_name].usage_percentage if plan_name in PLAN_CATALOG else DEFAULT_USAGE_PERCENTAGE
+    return {
+        "plan": plan_name,
+        "data_used_gb": round(usage_pct * 0.5, 1),
+        "data_limit": "Unlimited",
+        "usage_percentage": usage_pct
+    }
+
+_USAGE_FRAGMENTS = {name: _json_fields(_usage_fields(name)) for name in PLAN_CATALOG}
+
+_UNRESOLVED = object()
+
+class ToolContext:
+    """
+    Per-call state shared by every tool invocation in a call
+    
+    Holds the already-resolved customer record, the clock tools read "now"
+    from, and a cache of derived values (due dates, cycle ends), so repeated
+    tool calls in a call do no database work.
+    """
+    
+    def __init__(self, phone_number, customer=_UNRESOLVED, clock=datetime.now):
+        """
+        Args:
+            phone_number (str): Caller's phone number
+            customer (dict): Customer record if already resolved (None for a
+                known-unknown caller); looked up lazily when omitted
+            clock (callable): Returns the current datetime
+        """
+        self.phone_number = phone_number
+        self._customer = customer
+        self.clock = clock
+        self.derived = {}
+    
+    @property
+    def customer(self):
+        if self._customer is _UNRESOLVED:
+            self._customer = get_customer_by_phone(self.phone_number)
+        return self._customer
+    
+    def now(self):
+        return self.clock()
+    
+    def cached(self, key, compute):
+        """Return a derived value, computing it once per call"""
+        if key not in self.derived:
+            self.derived[key] = compute()
+        return self.derived[key]
+
+def _next_due_date(context):
+    """Next bill due date (15th of this or next month)"""
+    today = context.now()
+    if today.day < 15:
+        due_date = today.replace(day=15)
+    else:
+        next_month = today.replace(day=1) + timedelta(days=32)
+        due_date = next_month.replace(day=15)
+    return due_date.strftime("%Y-%m-%d")
+
+def check_bill(phone_number, context=None):
     """
     Get customer's monthly bill amount and due date
     
     Args:
         phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context; built on demand if omitted
         
     Returns:
         dict: Bill information including amount and due date
     """
-    customer = get_customer_by_phone(phone_number)
+    context = context or ToolContext(phone_number)
+    customer = context.customer
     
     if not customer:
         return {
@@ -26,32 +140,26 @@ def check_bill(phone_number):
             "due_date": None
         }
     
-    # Calculate next due date (15th of next month)
-    today = datetime.now()
-    if today.day < 15:
-        due_date = today.replace(day=15)
-    else:
-        next_month = today.replace(day=1) + timedelta(days=32)
-        due_date = next_month.replace(day=15)
-    
     return {
         "monthly_bill": customer['monthly_bill'],
-        "due_date": due_date.strftime("%Y-%m-%d"),
+        "due_date": context.cached('due_date', lambda: _next_due_date(context)),
         "account_id": customer['account_id'],
         "payment_status": "current"
     }
 
-def get_account_info(phone_number):
+def get_account_info(phone_number, context=None):
     """
     Get complete account information for customer
     
     Args:
         phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context; built on demand if omitted
         
     Returns:
         dict: Complete account information
     """
-    customer = get_customer_by_phone(phone_number)
+    context = context or ToolContext(phone_number)
+    customer = context.customer
     
     if not customer:
         return {"error": "Customer not found"}
@@ -67,51 +175,46 @@ def get_account_info(phone_number):
         "status": "active"
     }
 
-def check_plan(phone_number):
+def check_plan(phone_number, context=None):
     """
     Get customer's current plan details
     
     Args:
         phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context; built on demand if omitted
         
     Returns:
         dict: Plan information including features and pricing
     """
-    customer = get_customer_by_phone(phone_number)
+    context = context or ToolContext(phone_number)
+    customer = context.customer
     
     if not customer:
         return {"error": "Customer not found"}
     
-    # Plan features based on plan type
-    plan_features = {
-        "Unlimited Premium": ["Unlimited talk, text, data", "100GB premium data", "HD streaming", "International calling"],
-        "Unlimited Plus": ["Unlimited talk, text, data", "50GB premium data", "SD streaming", "Mobile hotspot"],
-        "Magenta Max": ["Unlimited talk, text, data", "Unlimited premium data", "4K streaming", "International data"],
-        "Magenta": ["Unlimited talk, text, data", "100GB premium data", "HD streaming"],
-        "Essentials": ["Unlimited talk, text, data", "Basic features only"],
-        "Go5G Plus": ["Unlimited talk, text, data", "100GB premium data", "Netflix included", "Apple TV+"],
-        "Go5G": ["Unlimited talk, text, data", "50GB premium data", "HD streaming"]
-    }
+    plan = PLAN_CATALOG.get(customer['plan'])
     
     return {
         "plan_name": customer['plan'],
         "monthly_cost": customer['monthly_bill'],
-        "features": plan_features.get(customer['plan'], ["Standard features"]),
+        "features": plan.features if plan else DEFAULT_FEATURES,
         "data_included": "Unlimited",
         "contract_type": "No contract"
     }
 
-def get_call_history(phone_number):
+def get_call_history(phone_number, context=None):
     """
     Get customer's previous call history and interactions
     
     Args:
         phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context; built on demand if omitted
         
     Returns:
         dict: Call history including sentiment and notes
     """
-    customer = get_customer_by_phone(phone_number)
+    context = context or ToolContext(phone_number)
+    customer = context.customer
     
     if not customer:
         return {"error": "Customer not found"}
@@ -124,78 +227,76 @@ def get_call_history(phone_number):
         "account_age_months": customer['account_age_months']
     }
 
-def check_data_usage(phone_number):
+def check_data_usage(phone_number, context=None):
     """
     Get customer's current data usage statistics
     
     Args:
         phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context; built on demand if omitted
         
     Returns:
         dict: Data usage information
     """
-    customer = get_customer_by_phone(phone_number)
+    context = context or ToolContext(phone_number)
+    customer = context.customer
     
     if not customer:
         return {"error": "Customer not found"}
     
     # Simulate data usage based on plan
-    usage_percentages = {
-        "Unlimited Premium": 65,
-        "Unlimited Plus": 72,
-        "Magenta Max": 58,
-        "Magenta": 80,
-        "Essentials": 45,
-        "Go5G Plus": 68,
-        "Go5G": 75
-    }
-    
-    usage_pct = usage_percentages.get(customer['plan'], 50)
-    
-    return {
-        "plan": customer['plan'],
-        "data_used_gb": round(usage_pct * 0.5, 1),
-        "data_limit": "Unlimited",
-        "usage_percentage": usage_pct,
-        "billing_cycle_end": (datetime.now() + timedelta(days=12)).strftime("%Y-%m-%d"),
+    result = _usage_fields(customer['plan'])
+    result.update({
+        "billing_cycle_end": context.cached(
+            'billing_cycle_end',
+            lambda: (context.now() + timedelta(days=12)).strftime("%Y-%m-%d")
+        ),
         "overage_charges": 0
-    }
+    })
+    return result
 
-def get_payment_history(phone_number):
+def get_payment_history(phone_number, context=None):
     """
     Get customer's payment history
     
     Args:
         phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context; built on demand if omitted
         
     Returns:
         dict: Payment history and status
     """
-    customer = get_customer_by_phone(phone_number)
+    context = context or ToolContext(phone_number)
+    customer = context.customer
     
     if not customer:
         return {"error": "Customer not found"}
     
     return {
         "payment_status": "current",
-        "last_payment_date": (datetime.now() - timedelta(days=18)).strftime("%Y-%m-%d"),
+        "last_payment_date": context.cached(
+            'last_payment_date',
+            lambda: (context.now() - timedelta(days=18)).strftime("%Y-%m-%d")
+        ),
         "last_payment_amount": customer['monthly_bill'],
         "payment_method": "Auto-pay (Credit Card)",
         "outstanding_balance": 0,
         "account_age_months": customer['account_age_months']
     }
 
-def check_network_status(phone_number):
+def check_network_status(phone_number, context=None):
     """
     Check network status and coverage for customer's location
     
     Args:
         phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context; built on demand if omitted
         
     Returns:
         dict: Network status information
     """
-    customer = get_customer_by_phone(phone_number)
+    context = context or ToolContext(phone_number)
+    customer = context.customer
     
     if not customer:
         return {"error": "Customer not found"}
@@ -210,17 +311,19 @@ def check_network_status(phone_number):
         "coverage_quality": "Excellent"
     }
 
-def get_upgrade_eligibility(phone_number):
+def get_upgrade_eligibility(phone_number, context=None):
     """
     Check if customer is eligible for device upgrade
     
     Args:
         phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context; built on demand if omitted
         
     Returns:
         dict: Upgrade eligibility information
     """
-    customer = get_customer_by_phone(phone_number)
+    context = context or ToolContext(phone_number)
+    customer = context.customer
     
     if not customer:
         return {"error": "Customer not found"}
@@ -237,32 +340,25 @@ def get_upgrade_eligibility(phone_number):
         "trade_in_available": eligible
     }
 
-def get_available_plans(phone_number):
+def get_available_plans(phone_number, context=None):
     """
     Get list of available plans for customer
     
     Args:
         phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context; built on demand if omitted
         
     Returns:
         dict: Available plans and pricing
     """
-    customer = get_customer_by_phone(phone_number)
+    context = context or ToolContext(phone_number)
+    customer = context.customer
     
     current_plan = customer['plan'] if customer else None
     
-    plans = [
-        {"name": "Essentials", "price": 55, "data": "Unlimited", "features": "Basic"},
-        {"name": "Magenta", "price": 70, "data": "Unlimited", "features": "HD Streaming"},
-        {"name": "Unlimited Plus", "price": 85, "data": "Unlimited", "features": "50GB Premium + Hotspot"},
-        {"name": "Magenta Max", "price": 90, "data": "Unlimited", "features": "Unlimited Premium + 4K"},
-        {"name": "Unlimited Premium", "price": 95, "data": "Unlimited", "features": "100GB Premium + International"},
-        {"name": "Go5G Plus", "price": 100, "data": "Unlimited", "features": "Premium + Netflix + Apple TV+"}
-    ]
-    
     return {
         "current_plan": current_plan,
-        "available_plans": plans,
+        "available_plans": [dict(plan) for plan in AVAILABLE_PLANS],
         "can_upgrade": True,
         "can_downgrade": True
     }
@@ -280,22 +376,118 @@ AVAILABLE_TOOLS = {
     'get_available_plans': get_available_plans
 }
 
-def call_tool(tool_name, phone_number):
+def _serialize_check_plan(result):
+    fragment = _PLAN_FRAGMENTS.get(result['plan_name'], _DEFAULT_PLAN_FRAGMENT)
+    head = _json_fields({"plan_name": result['plan_name'], "monthly_cost": result['monthly_cost']})
+    return f"{{{head}, {fragment}}}"
+
+def _serialize_check_data_usage(result):
+    fragment = _USAGE_FRAGMENTS.get(result['plan'])
+    if fragment is None:
+        return json.dumps(result)
+    tail = _json_fields({"billing_cycle_end": result['billing_cycle_end'], "overage_charges": result['overage_charges']})
+    return f"{{{fragment}, {tail}}}"
+
+def _serialize_get_available_plans(result):
+    head = _json_fields({"current_plan": result['current_plan']})
+    return f"{{{head}, {_AVAILABLE_PLANS_FRAGMENT}}}"
+
+# Tools whose static result parts are spliced from pre-serialized fragments
+_TOOL_SERIALIZERS = {
+    'check_plan': _serialize_check_plan,
+    'check_data_usage': _serialize_check_data_usage,
+    'get_available_plans': _serialize_get_available_plans
+}
+
+def serialize_tool_result(tool_name, result):
+    """
+    Serialize a tool result to JSON for the model
+    
+    Output is identical to json.dumps(result); for catalog-backed tools the
+    static parts come from cached fragments instead of being re-encoded.
+    
+    Args:
+        tool_name (str): Name of the tool that produced the result
+        result (dict): Result from the tool function
+        
+    Returns:
+        str: JSON text
+    """
+    serializer = _TOOL_SERIALIZERS.get(tool_name)
+    if serializer is None or 'error' in result:
+        return json.dumps(result)
+    return serializer(result)
+
+def _loop_running():
+    """True if this thread is already running an event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+def call_tool(tool_name, phone_number, context=None):
     """
     Call a tool by name with the customer's phone number
     
+    Async tools are run to completion on a fresh event loop, so the voice
+    server's worker threads can use either kind. Inside a running loop that
+    isn't possible; await call_tool_async there instead.
+    
     Args:
         tool_name (str): Name of the tool to call
         phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context holding the resolved customer
         
     Returns:
         dict: Result from the tool function
     """
     if tool_name in AVAILABLE_TOOLS:
-        return AVAILABLE_TOOLS[tool_name](phone_number)
+        tool = AVAILABLE_TOOLS[tool_name]
+        if inspect.iscoroutinefunction(tool):
+            if _loop_running():
+                return {"error": f"Tool '{tool_name}' is async; use call_tool_async"}
+            return asyncio.run(tool(phone_number, context))
+        return tool(phone_number, context)
     else:
         return {"error": f"Tool '{tool_name}' not found"}
 
+async def call_tool_async(tool_name, phone_number, context=None, executor=None):
+    """
+    Awaitable version of call_tool
+    
+    Tools registered as coroutine functions (async def) are awaited directly,
+    so their I/O doesn't hold a thread. Sync tools are run in `executor`
+    (the loop's default executor if None) so they never block the loop.
+    
+    Args:
+        tool_name (str): Name of the tool to call
+        phone_number (str): Customer's phone number
+        context (ToolContext): Per-call context holding the resolved customer
+        executor (Executor): Where to run sync tools
+        
+    Returns:
+        dict: Result from the tool function
+    """
+    tool = AVAILABLE_TOOLS.get(tool_name)
+    if tool is None:
+        return {"error": f"Tool '{tool_name}' not found"}
+    if inspect.iscoroutinefunction(tool):
+        return await tool(phone_number, context)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(tool, phone_number, context))
+
+async def call_tools_async(tool_names, phone_number, context=None, executor=None):
+    """
+    Run several tools concurrently
+    
+    Returns:
+        list: Results in the same order as tool_names
+    """
+    return await asyncio.gather(*(
+        call_tool_async(tool_name, phone_number, context, executor) for tool_name in tool_names
+    ))
+
 if __name__ == "__main__":
     # Test all tools
     test_phone = '+17206866656'
@@ -6,10 +6,27 @@ from twilio.twiml.voice_response import VoiceResponse, Gather, Dial
 from twilio.rest import Client
 from openai import OpenAI
 from datetime import datetime
+import random
+import re
 import requests
+import time
+import types
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
-from tools import call_tool, AVAILABLE_TOOLS
-from customer_db import get_customer_by_phone
+from tools import call_tool, serialize_tool_result, AVAILABLE_TOOLS, ToolContext
+from customer_db import get_customer_by_phone, start_customer_db_watcher
+from tool_cache import ToolResultCache
+from intent_router import route_intent
+from response_renderer import render_tool_response, render_tool_responses
+from conversation_memory import ConversationMemory, extractive_summary, truncate_to_tokens
+from job_queue import JobQueue
+from call_sessions import CallSession, SessionReaper, create_session_store
+from llm_hedging import DeadlineExceeded, HedgedRequester
+from http_pools import (
+    ConnectionStats, build_openrouter_http_client, build_twilio_http_client,
+    start_connection_warmer, twilio_connection_stats,
+)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,20 +40,146 @@ TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN', '')
 DEEPGRAM_API_KEY = os.environ.get('DEEPGRAM_API_KEY', '')
 HUMAN_AGENT_PHONE = os.environ.get('HUMAN_AGENT_PHONE', '')
 
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Keep-alive connection pools sized to worker concurrency, so a turn never
+# waits on DNS/TCP/TLS setup; the warmer pings both APIs to keep them hot
+LLM_WORKERS = int(os.environ.get('LLM_WORKERS', 16))
+TWILIO_HTTP_POOL_SIZE = int(os.environ.get('TWILIO_HTTP_POOL_SIZE', 8))
+HTTP_WARMUP_INTERVAL = float(os.environ.get('HTTP_WARMUP_INTERVAL', 30.0))
+openrouter_connection_stats = ConnectionStats()
+# Each LLM worker may have a primary and a hedged request in flight
+openrouter_http = build_openrouter_http_client(LLM_WORKERS * 2, openrouter_connection_stats)
+twilio_http = build_twilio_http_client(TWILIO_HTTP_POOL_SIZE)
+
 # Initialize OpenRouter client for Nemotron
 openrouter_client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
+    base_url=OPENROUTER_BASE_URL,
     api_key=OPENROUTER_API_KEY,
+    http_client=openrouter_http,
 )
 
 # Initialize Twilio client
-twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, http_client=twilio_http)
+
+start_connection_warmer({
+    'openrouter': lambda: openrouter_http.head(f"{OPENROUTER_BASE_URL}/models"),
+    'twilio': lambda: twilio_http.session.head("https://api.twilio.com/2010-04-01", timeout=10),
+}, HTTP_WARMUP_INTERVAL)
+
+# Load customer index up front and hot-reload it when the JSON file changes
+start_customer_db_watcher()
+
+# One CallSession per call: customer, prompt, history and recording metadata.
+# 'memory' is sharded in-process; 'sqlite' is shared by every gunicorn worker
+session_store = create_session_store(
+    os.environ.get('CALL_SESSION_STORE', 'memory'),
+    os.environ.get('CALL_SESSION_DB', 'call_sessions.db')
+)
+# Sessions that never reach /end-call (dropped calls, lost callbacks) are
+# evicted after SESSION_IDLE_TTL seconds without a webhook, or
+# SESSION_ABSOLUTE_TTL seconds after the call started
+session_reaper = SessionReaper(
+    session_store,
+    idle_ttl=float(os.environ.get('SESSION_IDLE_TTL', 30 * 60)),
+    absolute_ttl=float(os.environ.get('SESSION_ABSOLUTE_TTL', 4 * 60 * 60)),
+    interval=float(os.environ.get('SESSION_REAP_INTERVAL', 60)),
+    on_evict=lambda session, reason: release_call(session, reason)
+)
+# Cache tool results for speed (per-tool TTLs, LRU-bounded). Process-local:
+# a miss on another worker only recomputes the result
+tool_result_cache = ToolResultCache(max_entries=int(os.environ.get('TOOL_CACHE_MAX_ENTRIES', 10000)))
+
+# Tool calls requested in one LLM turn run concurrently on this pool
+TOOL_WORKERS = int(os.environ.get('TOOL_WORKERS', 8))
+TOOL_TIMEOUT_SECONDS = float(os.environ.get('TOOL_TIMEOUT_SECONDS', 2.0))
+TOOL_TIMEOUTS = {}  # Per-tool overrides, e.g. {'check_network_status': 4.0}
+tool_executor = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix='tool')
+
+# Tools speculatively run at call start, most likely first (by customer plan).
+# Override with PREFETCH_TOOLS='{"default": ["check_bill"], "Magenta": [...]}'
+PREFETCH_TOOLS = {
+    'default': ['check_bill', 'check_plan'],
+    'Essentials': ['check_bill', 'check_data_usage', 'get_upgrade_eligibility'],
+    'Magenta': ['check_data_usage', 'check_bill'],
+    'Unlimited Plus': ['check_bill', 'check_data_usage'],
+}
+PREFETCH_TOOLS.update(json.loads(os.environ.get('PREFETCH_TOOLS', '{}')))
+prefetch_futures = {}  # In-flight prefetches (this process): call_sid -> {tool_name: future}
+# One ToolContext per call (this process), so derived values like the due
+# date are computed once per call; another worker builds its own on first use
+tool_contexts = {}  # call_sid -> ToolContext
+
+# Speak templated tool answers instead of making a second completion call;
+# tools without a template still fall back to the model
+TEMPLATE_TOOL_RESPONSES = os.environ.get('TEMPLATE_TOOL_RESPONSES', 'true').lower() != 'false'
 
-# Store conversation history and call metadata
-conversation_history = {}
-call_recordings = {}  # Store recording URLs and metadata
-customer_cache = {}  # Cache customer data per call
-tool_result_cache = {}  # Cache tool results for speed
+# Stream completions and speak the first sentence (or clause) as soon as it
+# arrives; the rest is spoken by /continue-response
+STREAM_RESPONSES = os.environ.get('STREAM_RESPONSES', 'true').lower() != 'false'
+FIRST_CHUNK_MIN_CHARS = 12  # Shortest clause worth flushing on a comma
+CONTINUE_RESPONSE_TIMEOUT = float(os.environ.get('CONTINUE_RESPONSE_TIMEOUT', 10.0))
+llm_executor = ThreadPoolExecutor(max_workers=LLM_WORKERS, thread_name_prefix='llm')
+pending_replies = {}  # This process's streams: call_sid -> (spoken first chunk, Future of the full reply)
+
+# Per-turn latency budget: a completion that hasn't started answering by the
+# hedge percentile gets a duplicate request (to LLM_FALLBACK_MODEL if set);
+# the first to answer wins. Past the budget the caller hears a filler line.
+LLM_MODEL = "nvidia/nemotron-nano-9b-v2:free"
+LLM_FALLBACK_MODEL = os.environ.get('LLM_FALLBACK_MODEL', '') or LLM_MODEL
+LLM_TURN_BUDGET_SECONDS = float(os.environ.get('LLM_TURN_BUDGET_SECONDS', 4.0))
+LLM_FILLER_RESPONSE = "Sorry, I'm a little slow right now. Could you say that again?"
+llm_hedger = HedgedRequester(
+    ThreadPoolExecutor(max_workers=LLM_WORKERS * 2, thread_name_prefix='llm-attempt'),
+    percentile=float(os.environ.get('LLM_HEDGE_PERCENTILE', 90)),
+    default_delay=float(os.environ.get('LLM_HEDGE_DELAY', 1.5)),
+)
+
+# Static prompt prefix and tool schema are built once per process and the
+# customer line once per call, so every turn sends byte-identical leading
+# messages and provider-side prefix caching can hit
+SYSTEM_PROMPT_PREFIX = """Fast telecom AI. ONE sentence only.
+Tools: check_bill, check_plan, check_data_usage, get_upgrade_eligibility
+Use tools immediately."""
+LLM_TOOL_DESCRIPTIONS = {
+    'check_bill': "Get bill",
+    'check_plan': "Get plan",
+    'check_data_usage': "Get data",
+    'get_upgrade_eligibility': "Check upgrade",
+}
+LLM_TOOLS = [
+    {"type": "function", "function": {"name": name, "description": description, "parameters": {"type": "object", "properties": {}, "required": []}}}
+    for name, description in LLM_TOOL_DESCRIPTIONS.items()
+]
+LLM_TOOLS_BYTES = len(json.dumps(LLM_TOOLS))
+
+# Conversation memory: recent turns verbatim within MEMORY_TOKEN_BUDGET, older
+# turns folded into a running summary on memory_executor (never on the reply path)
+MEMORY_TOKEN_BUDGET = int(os.environ.get('MEMORY_TOKEN_BUDGET', 400))
+MEMORY_MAX_TURNS = int(os.environ.get('MEMORY_MAX_TURNS', 6))
+MEMORY_SUMMARY_TOKENS = int(os.environ.get('MEMORY_SUMMARY_TOKENS', 80))
+memory_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='memory')
+
+session_reaper.start()
+
+# Non-essential Twilio REST calls (recording start) run here with retries,
+# so webhook responses depend only on local work
+SIDE_EFFECT_RETRIES = int(os.environ.get('SIDE_EFFECT_RETRIES', 4))
+SIDE_EFFECT_BACKOFF_SECONDS = float(os.environ.get('SIDE_EFFECT_BACKOFF_SECONDS', 0.5))
+side_effect_executor = ThreadPoolExecutor(max_workers=TWILIO_HTTP_POOL_SIZE, thread_name_prefix='side-effect')
+
+# Recording download + tonality analysis run here, not in the webhook.
+# The queue file is shared by every worker process, and jobs survive restarts.
+recording_jobs = JobQueue(
+    os.environ.get('JOB_QUEUE_DB', 'jobs.db'),
+    {'process_recording': lambda **job: download_recording(**job)},
+    workers=int(os.environ.get('JOB_WORKERS', 2)),
+    max_attempts=int(os.environ.get('JOB_MAX_ATTEMPTS', 5)),
+    backoff=float(os.environ.get('JOB_RETRY_BACKOFF_SECONDS', 5.0))
+)
+
+_SENTENCE_END = re.compile(r'[.!?](?=\s)')
+_CLAUSE_END = re.compile(r'[,;:](?=\s)')
 
 # Create recordings directory if it doesn't exist
 RECORDINGS_DIR = 'recordings'
@@ -61,34 +204,31 @@ def voice():
     print(f"⏰ Time: {datetime.now()}")
     print("=" * 50)
     
-    # Initialize conversation history for this call
-    conversation_history[call_sid] = []
-    call_recordings[call_sid] = {
-        'from': from_number,
-        'start_time': datetime.now().isoformat(),
-        'recordings': []
-    }
-    
-    # Cache customer data for fast tool calls
+    # Resolve the customer once; the session carries it for every turn
     customer = get_customer_by_phone(from_number)
     if customer:
-        customer_cache[call_sid] = customer
-        customer_cache[f"{call_sid}_phone"] = from_number
         print(f"✅ Customer cached: {customer['name']}")
     else:
-        customer_cache[call_sid] = None
-        customer_cache[f"{call_sid}_phone"] = from_number
         print(f"ℹ️ Unknown caller: {from_number}")
+    session_store.put(CallSession(
+        call_sid,
+        from_number,
+        customer=customer,
+        system_prompt=build_system_prompt(customer),
+        memory=new_conversation_memory(),
+        metadata={
+            'from': from_number,
+            'start_time': datetime.now().isoformat(),
+            'recordings': []
+        }
+    ))
     
-    # Start recording the call using Twilio API (non-blocking)
-    try:
-        recording = twilio_client.calls(call_sid).recordings.create(
-            recording_status_callback=request.url_root + 'recording-status',
-            recording_status_callback_method='POST'
-        )
-        print(f"🎙️ Recording started: {recording.sid}")
-    except Exception as e:
-        print(f"⚠️ Could not start recording: {e}")
+    # Compute likely tool results while the greeting plays
+    tool_contexts[call_sid] = ToolContext(from_number, customer=customer)
+    prefetch_tools(call_sid, tool_contexts[call_sid])
+    
+    # Start recording the call in the background - the greeting doesn't wait on Twilio
+    submit_side_effect(start_call_recording, call_sid, request.url_root + 'recording-status')
     
     # Start TwiML response
     resp = VoiceResponse()
@@ -160,8 +300,10 @@ def process():
         resp.redirect('/listen')
         return str(resp), 200, {'Content-Type': 'text/xml'}
     
-    # Get AI response using Nemotron
-    ai_response = get_nemotron_response(call_sid, speech_result)
+    # Get AI response using Nemotron (first sentence as soon as it streams in)
+    turn_started = time.monotonic()
+    ai_response, full_reply = start_streamed_response(call_sid, speech_result)
+    record_turn_latency(call_sid, turn_started, streamed=full_reply is not None)
     print(f"🤖 AI says: {ai_response}")
     
     # Speak the AI response
@@ -169,11 +311,161 @@ def process():
              voice='Polly.Joanna', 
              language='en-US')
     
-    # Continue listening
-    resp.redirect('/listen')
+    if full_reply is not None:
+        # Rest of the reply is still generating; speak it after this chunk
+        hold_pending_reply(call_sid, ai_response, full_reply)
+        resp.redirect('/continue-response')
+    else:
+        # Continue listening
+        resp.redirect('/listen')
+    
+    return str(resp), 200, {'Content-Type': 'text/xml'}
+
+@app.route("/continue-response", methods=['GET', 'POST'])
+def continue_response():
+    """Speak the remainder of a streamed reply, then keep listening."""
+    call_sid = request.form.get('CallSid', 'unknown')
+    resp = VoiceResponse()
+    
+    pending = take_pending_reply(call_sid)
+    if pending:
+        first_chunk, full_response = pending
+        if full_response.startswith(first_chunk):
+            rest = full_response[len(first_chunk):].strip()
+        else:
+            # Tool call came after the first chunk; the answer is all new text
+            rest = full_response
+        if rest:
+            print(f"🤖 AI continues: {rest}")
+            resp.say(rest, 
+                     voice='Polly.Joanna', 
+                     language='en-US')
     
+    resp.redirect('/listen')
     return str(resp), 200, {'Content-Type': 'text/xml'}
 
+def submit_side_effect(fn, *args):
+    """Run fn(*args) on side_effect_executor with retry and exponential backoff."""
+    return side_effect_executor.submit(run_with_retry, fn, *args)
+
+def run_with_retry(fn, *args):
+    """
+    Call fn(*args), retrying transient failures.
+    
+    Connection errors, 429s and 5xx responses are retried up to
+    SIDE_EFFECT_RETRIES times with jittered exponential backoff; other
+    errors (e.g. a 404 because the call already ended) are not.
+    """
+    for attempt in range(SIDE_EFFECT_RETRIES + 1):
+        try:
+            return fn(*args)
+        except Exception as e:
+            status = getattr(e, 'status', None)
+            retryable = status is None or status == 429 or status >= 500
+            if not retryable or attempt == SIDE_EFFECT_RETRIES:
+                print(f"⚠️ {fn.__name__} failed: {e}")
+                return None
+            delay = SIDE_EFFECT_BACKOFF_SECONDS * (2 ** attempt) * (0.5 + random.random())
+            print(f"🔁 {fn.__name__} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+def start_call_recording(call_sid, status_callback_url):
+    """Start recording a call via the Twilio API and note it on the session."""
+    recording = twilio_client.calls(call_sid).recordings.create(
+        recording_status_callback=status_callback_url,
+        recording_status_callback_method='POST'
+    )
+    print(f"🎙️ Recording started: {recording.sid}")
+    session_store.update(call_sid, lambda session: session.metadata.update(recording_started_sid=recording.sid))
+    return recording.sid
+
+def hold_pending_reply(call_sid, first_chunk, full_reply):
+    """
+    Keep a still-generating reply for /continue-response.
+    
+    The Future stays in this process; the finished text is also written to
+    the session so /continue-response can be served by another worker.
+    """
+    pending_replies[call_sid] = (first_chunk, full_reply)
+    def start(session):
+        session.pending_reply = {'first_chunk': first_chunk, 'text': None}
+    session_store.update(call_sid, start)
+    
+    def finish(future):
+        text = future.result() if future.exception() is None else ''
+        def store(session):
+            if session.pending_reply and session.pending_reply['first_chunk'] == first_chunk:
+                session.pending_reply['text'] = text
+        session_store.update(call_sid, store)
+    full_reply.add_done_callback(finish)
+
+def take_pending_reply(call_sid):
+    """
+    Wait (up to CONTINUE_RESPONSE_TIMEOUT) for the rest of a streamed reply.
+    
+    Returns:
+        tuple: (first chunk already spoken, full reply or '' on timeout), or
+        None if nothing is pending
+    """
+    deadline = time.monotonic() + CONTINUE_RESPONSE_TIMEOUT
+    local = pending_replies.pop(call_sid, None)
+    if local:
+        first_chunk, full_reply = local
+        try:
+            full_response = full_reply.result(timeout=CONTINUE_RESPONSE_TIMEOUT)
+        except FutureTimeoutError:
+            print(f"⏱️ Reply still generating after {CONTINUE_RESPONSE_TIMEOUT}s, moving on")
+            full_response = ''
+        session_store.update(call_sid, lambda session: setattr(session, 'pending_reply', None))
+        return first_chunk, full_response
+    
+    # Generated on another worker - poll the shared session for the text
+    while True:
+        session = session_store.get(call_sid)
+        pending = session.pending_reply if session else None
+        if not pending:
+            return None
+        if pending['text'] is not None or time.monotonic() >= deadline:
+            if pending['text'] is None:
+                print(f"⏱️ Reply still generating after {CONTINUE_RESPONSE_TIMEOUT}s, moving on")
+            session_store.update(call_sid, lambda session: setattr(session, 'pending_reply', None))
+            return pending['first_chunk'], pending['text'] or ''
+        time.sleep(0.05)
+
+def start_streamed_response(call_sid, user_message):
+    """
+    Start generating a reply and return as soon as there is something to say.
+    
+    Returns:
+        tuple: (text to speak now, Future of the full reply or None if the
+        text is already the whole reply)
+    """
+    if not STREAM_RESPONSES:
+        return get_nemotron_response(call_sid, user_message), None
+    
+    first_chunk = Future()
+    def on_first_chunk(text):
+        if not first_chunk.done():
+            first_chunk.set_result(format_for_speech(text))
+    
+    full_reply = llm_executor.submit(get_nemotron_response, call_sid, user_message, on_first_chunk)
+    wait([first_chunk, full_reply], return_when=FIRST_COMPLETED)
+    if full_reply.done():
+        # Finished before (or without) an early flush - say it all at once
+        return full_reply.result(), None
+    return first_chunk.result(), full_reply
+
+def record_turn_latency(call_sid, turn_started, streamed):
+    """Record time-to-first-audio for a turn on the call's metadata."""
+    ttfa_ms = (time.monotonic() - turn_started) * 1000
+    print(f"⏱️ Time to first audio: {ttfa_ms:.0f} ms{' (streamed)' if streamed else ''}")
+    entry = {
+        'time_to_first_audio_ms': round(ttfa_ms, 1),
+        'streamed': streamed,
+        'timestamp': datetime.now().isoformat()
+    }
+    session_store.update(call_sid, lambda session: session.metadata.setdefault('turn_latencies', []).append(entry))
+
 def format_for_speech(text):
     """Ultra-fast TTS formatting - critical replacements only."""
     # Fast replacements for common patterns
@@ -182,117 +474,388 @@ def format_for_speech(text):
     text = text.replace('GB', ' gigabytes')  # data usage
     return text
 
-def get_nemotron_response(call_sid, user_message):
-    """Get response from Nemotron AI with tool calling support."""
-    try:
-        # Initialize conversation history if needed
-        if call_sid not in conversation_history:
-            conversation_history[call_sid] = []
-        
-        # Get customer data from cache
-        customer = customer_cache.get(call_sid)
-        from_number = customer_cache.get(f"{call_sid}_phone", "Unknown")
-        
-        # Build messages
-        messages = []
-        
-        # ULTRA-COMPACT system prompt for maximum speed
-        system_prompt = f"""Fast telecom AI. ONE sentence only.
-Tools: check_bill, check_plan, check_data_usage, get_upgrade_eligibility
-Customer: {customer['name'] if customer else 'Unknown'}
-Use tools immediately."""
+def get_tool_context(session):
+    """
+    This process's ToolContext for a call, built from the session on first use.
+    
+    Returns:
+        ToolContext: The same object for every turn of the call
+    """
+    tool_context = tool_contexts.get(session.call_sid)
+    if tool_context is None:
+        tool_context = tool_contexts.setdefault(
+            session.call_sid, ToolContext(session.from_number, customer=session.customer)
+        )
+    return tool_context
 
-        messages.append({'role': 'system', 'content': system_prompt})
-        
-        # MINIMAL history - last 4 messages only for speed
-        if len(conversation_history[call_sid]) > 4:
-            messages.extend(conversation_history[call_sid][-4:])
+def prefetch_tools(call_sid, tool_context):
+    """Start the customer's most likely tools in the background at call start."""
+    customer = tool_context.customer
+    if not customer:
+        return
+    tool_names = PREFETCH_TOOLS.get(customer['plan'], PREFETCH_TOOLS['default'])
+    call_prefetches = prefetch_futures.setdefault(call_sid, {})
+    for tool_name in tool_names:
+        if tool_name not in AVAILABLE_TOOLS or tool_name in call_prefetches:
+            continue
+        future = tool_executor.submit(call_tool, tool_name, tool_context.phone_number, tool_context)
+        call_prefetches[tool_name] = future
+        future.add_done_callback(lambda f, call_sid=call_sid, tool_name=tool_name: _store_prefetched(call_sid, tool_name, f))
+
+def _store_prefetched(call_sid, tool_name, future):
+    """Move a finished prefetch into tool_result_cache (if the call is still live)."""
+    call_prefetches = prefetch_futures.get(call_sid)
+    if call_prefetches is None:
+        return
+    call_prefetches.pop(tool_name, None)
+    if future.exception() is None:
+        tool_result_cache.put(call_sid, tool_name, future.result())
+
+def run_tools(call_sid, tool_context, tool_names):
+    """
+    Run several tools for a call concurrently.
+    
+    Cached results are returned immediately; the rest run on tool_executor.
+    A tool that misses its timeout is reported as unavailable instead of
+    stalling the reply.
+    
+    Returns:
+        list: Tool results in the same order as tool_names
+    """
+    started = time.monotonic()
+    pending = []
+    for tool_name in tool_names:
+        cached_result = tool_result_cache.get(call_sid, tool_name)
+        prefetch = prefetch_futures.get(call_sid, {}).get(tool_name)
+        if cached_result is not None:
+            print(f"⚡ Tool cached: {tool_name}")
+            pending.append((tool_name, cached_result, None))
+        elif prefetch is not None:
+            # Prefetch still running; wait on it rather than starting again
+            print(f"⚡ Tool prefetching: {tool_name}")
+            pending.append((tool_name, None, prefetch))
         else:
-            messages.extend(conversation_history[call_sid])
+            future = tool_executor.submit(call_tool, tool_name, tool_context.phone_number, tool_context)
+            pending.append((tool_name, None, future))
+    
+    results = []
+    for tool_name, cached_result, future in pending:
+        if future is None:
+            results.append(cached_result)
+            continue
+        deadline = started + TOOL_TIMEOUTS.get(tool_name, TOOL_TIMEOUT_SECONDS)
+        try:
+            tool_result = future.result(timeout=max(0, deadline - time.monotonic()))
+            tool_result_cache.put(call_sid, tool_name, tool_result)
+            print(f"🔧 Tool called: {tool_name}")
+        except FutureTimeoutError:
+            print(f"⏱️ Tool timed out: {tool_name}")
+            tool_result = {"error": f"{tool_name} is temporarily unavailable"}
+        except Exception as e:
+            print(f"❌ Tool failed: {tool_name}: {e}")
+            tool_result = {"error": f"{tool_name} is temporarily unavailable"}
+        results.append(tool_result)
+    return results
+
+def run_tool_calls(call_sid, tool_context, tool_calls):
+    """
+    Run every tool call from one model turn concurrently.
+    
+    Returns:
+        list: (tool_call, tool_result) pairs in the order the model asked
+    """
+    tool_names = [tool_call.function.name for tool_call in tool_calls]
+    return list(zip(tool_calls, run_tools(call_sid, tool_context, tool_names)))
+
+def get_fast_path_response(call_sid, tool_context, user_message):
+    """
+    Answer simple requests ("what's my bill") locally, without the LLM.
+    
+    Returns:
+        str: Templated answer, or None if the model should handle the turn
+    """
+    if not tool_context.customer:
+        return None
+    tool_name = route_intent(user_message, customer_plan=tool_context.customer['plan'])
+    if tool_name is None:
+        return None
+    tool_result = run_tools(call_sid, tool_context, [tool_name])[0]
+    ai_response = render_tool_response(tool_name, tool_result)
+    if ai_response:
+        print(f"⚡ Fast path: {tool_name}")
+    return ai_response
+
+def find_flush_point(text):
+    """Index just past the first sentence end (or long-enough clause), or None."""
+    match = _SENTENCE_END.search(text)
+    if match:
+        return match.end()
+    for match in _CLAUSE_END.finditer(text):
+        if match.end() >= FIRST_CHUNK_MIN_CHARS:
+            return match.end()
+    return None
+
+def create_chat_completion(on_first_chunk=None, deadline=None, **params):
+    """
+    Run a hedged, deadline-bounded chat completion and return the assistant message.
+    
+    With on_first_chunk, on_first_chunk(text) is called once with the first
+    sentence or clause as soon as it is complete; tool calls detected
+    mid-stream are assembled from their deltas.
+    
+    Raises:
+        DeadlineExceeded: Neither request answered before deadline
+    """
+    if deadline is None:
+        deadline = time.monotonic() + LLM_TURN_BUDGET_SECONDS
+    hedge_params = dict(params, model=LLM_FALLBACK_MODEL)
+    return llm_hedger.run(
+        lambda race, attempt_id: stream_chat_completion(race, attempt_id, on_first_chunk, params),
+        lambda race, attempt_id: stream_chat_completion(race, attempt_id, on_first_chunk, hedge_params),
+        deadline
+    )
+
+def stream_chat_completion(race, attempt_id, on_first_chunk, params):
+    """
+    One attempt of a hedged completion, streamed so the loser can be cancelled.
+    
+    Returns:
+        SimpleNamespace: content and tool_calls, or None if another attempt won
+    """
+    stream = openrouter_client.chat.completions.create(stream=True, **params)
+    race.on_cancel(attempt_id, stream.close)
+    
+    content = []
+    tool_calls = {}
+    flushed = False
+    for chunk in stream:
+        if race.lost(attempt_id):
+            return None
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        for tool_delta in delta.tool_calls or []:
+            entry = tool_calls.setdefault(tool_delta.index, {'id': None, 'name': '', 'arguments': ''})
+            if tool_delta.id:
+                entry['id'] = tool_delta.id
+            if tool_delta.function and tool_delta.function.name:
+                entry['name'] += tool_delta.function.name
+            if tool_delta.function and tool_delta.function.arguments:
+                entry['arguments'] += tool_delta.function.arguments
+        if delta.content:
+            content.append(delta.content)
+            if on_first_chunk is not None and not flushed and not tool_calls:
+                text = ''.join(content)
+                cut = find_flush_point(text)
+                if cut:
+                    if not race.claim(attempt_id):
+                        return None
+                    on_first_chunk(text[:cut].strip())
+                    flushed = True
+    
+    return types.SimpleNamespace(
+        content=''.join(content) or None,
+        tool_calls=[
+            types.SimpleNamespace(id=entry['id'], function=types.SimpleNamespace(name=entry['name'], arguments=entry['arguments']))
+            for _, entry in sorted(tool_calls.items())
+        ] or None
+    )
+
+def get_nemotron_response(call_sid, user_message, on_first_chunk=None):
+    """
+    Get response from Nemotron AI with tool calling support.
+    
+    Pass on_first_chunk to stream: it receives the first sentence as soon as
+    it is generated, while this call still returns the full reply.
+    """
+    turn_deadline = time.monotonic() + LLM_TURN_BUDGET_SECONDS
+    spoken = []  # First chunk, once it has been handed to the caller
+    if on_first_chunk is not None:
+        speak_first_chunk = on_first_chunk
+        def on_first_chunk(text):
+            spoken.append(text)
+            speak_first_chunk(text)
+    try:
+        # Load the call's session (start one if /voice never ran for it)
+        session = session_store.get(call_sid)
+        if session is None:
+            session = CallSession(call_sid, "Unknown", system_prompt=build_system_prompt(None),
+                                  memory=new_conversation_memory())
+            session_store.put(session)
+        # Tools reuse the call's context (and the session's customer)
+        # instead of hitting the database
+        tool_context = get_tool_context(session)
         
-        messages.append({'role': 'user', 'content': user_message})
+        # FAST PATH - simple lookups skip the LLM entirely
+        ai_response = get_fast_path_response(call_sid, tool_context, user_message)
+        if ai_response:
+            remember_turn(call_sid, user_message, ai_response)
+            return format_for_speech(ai_response)
         
-        # REDUCED tools - only most common for speed
-        tools = [
-            {"type": "function", "function": {"name": "check_bill", "description": "Get bill", "parameters": {"type": "object", "properties": {}, "required": []}}},
-            {"type": "function", "function": {"name": "check_plan", "description": "Get plan", "parameters": {"type": "object", "properties": {}, "required": []}}},
-            {"type": "function", "function": {"name": "check_data_usage", "description": "Get data", "parameters": {"type": "object", "properties": {}, "required": []}}},
-            {"type": "function", "function": {"name": "get_upgrade_eligibility", "description": "Check upgrade", "parameters": {"type": "object", "properties": {}, "required": []}}}
-        ]
+        # Build messages: system prompt built at call start (same bytes every
+        # turn), then running summary and recent turns, then this utterance
+        prompt_started = time.perf_counter()
+        messages = [{'role': 'system', 'content': session.system_prompt}]
+        if session.memory is not None:
+            messages.extend(session.memory.messages())
+        messages.append({'role': 'user', 'content': user_message})
+        prompt_build_ms = (time.perf_counter() - prompt_started) * 1000
+        request_bytes = len(json.dumps(messages)) + LLM_TOOLS_BYTES
         
         # SPEED-OPTIMIZED API call with function calling
-        response = openrouter_client.chat.completions.create(
-            model="nvidia/nemotron-nano-9b-v2:free",
+        message = create_chat_completion(
+            on_first_chunk,
+            turn_deadline,
+            model=LLM_MODEL,
             messages=messages,
             max_tokens=40,        # REDUCED from 60 for speed
             temperature=0.5,      # REDUCED from 0.7 for faster token selection
             top_p=0.85,           # ADDED for speed optimization
-            tools=tools,
+            tools=LLM_TOOLS,
             tool_choice="auto"
         )
         
-        message = response.choices[0].message
-        
         # Check if model wants to call a tool
         if message.tool_calls:
-            tool_call = message.tool_calls[0]
-            tool_name = tool_call.function.name
+            # Run all requested tools at once (CACHED where possible)
+            tool_results = run_tool_calls(call_sid, tool_context, message.tool_calls)
             
-            # CACHED tool execution for speed
-            cache_key = f"{call_sid}_{tool_name}"
-            if cache_key in tool_result_cache:
-                tool_result = tool_result_cache[cache_key]
-                print(f"⚡ Tool cached: {tool_name}")
-            else:
-                tool_result = call_tool(tool_name, from_number)
-                tool_result_cache[cache_key] = tool_result
-                print(f"🔧 Tool called: {tool_name}")
-            
-            # Add tool call and result to messages
+            # Add tool calls and all results to messages in one batch
             messages.append({
                 'role': 'assistant',
                 'content': None,
-                'tool_calls': [{'id': tool_call.id, 'type': 'function', 'function': {'name': tool_name, 'arguments': '{}'}}]
-            })
-            messages.append({
-                'role': 'tool',
-                'tool_call_id': tool_call.id,
-                'content': json.dumps(tool_result)
+                'tool_calls': [
+                    {'id': tool_call.id, 'type': 'function', 'function': {'name': tool_call.function.name, 'arguments': '{}'}}
+                    for tool_call, _ in tool_results
+                ]
             })
+            for tool_call, tool_result in tool_results:
+                messages.append({
+                    'role': 'tool',
+                    'tool_call_id': tool_call.id,
+                    'content': serialize_tool_result(tool_call.function.name, tool_result)
+                })
             
-            # Get final response from model with tool result - SPEED OPTIMIZED
-            final_response = openrouter_client.chat.completions.create(
-                model="nvidia/nemotron-nano-9b-v2:free",
-                messages=messages,
-                max_tokens=35,        # REDUCED from 50 for speed
-                temperature=0.5,      # REDUCED from 0.7
-                top_p=0.85           # ADDED for speed
-            )
+            # Templated answer when every tool has one - no second LLM call
+            ai_response = None
+            if TEMPLATE_TOOL_RESPONSES:
+                ai_response = render_tool_responses(
+                    [(tool_call.function.name, tool_result) for tool_call, tool_result in tool_results]
+                )
             
-            ai_response = final_response.choices[0].message.content.strip()
+            if not ai_response:
+                request_bytes += len(json.dumps(messages))
+                # Get final response from model with tool result - SPEED OPTIMIZED
+                final_message = create_chat_completion(
+                    on_first_chunk,
+                    turn_deadline,
+                    model=LLM_MODEL,
+                    messages=messages,
+                    max_tokens=35,        # REDUCED from 50 for speed
+                    temperature=0.5,      # REDUCED from 0.7
+                    top_p=0.85           # ADDED for speed
+                )
+                
+                ai_response = final_message.content.strip()
             
             # Add final response to history
-            conversation_history[call_sid].append({'role': 'user', 'content': user_message})
-            conversation_history[call_sid].append({'role': 'assistant', 'content': ai_response})
+            remember_turn(call_sid, user_message, ai_response)
         else:
             # No tool call, use direct response
             ai_response = message.content.strip() if message.content else "I'm here to help!"
             
             # Add to history
-            conversation_history[call_sid].append({'role': 'user', 'content': user_message})
-            conversation_history[call_sid].append({'role': 'assistant', 'content': ai_response})
+            remember_turn(call_sid, user_message, ai_response)
+        
+        record_prompt_stats(call_sid, prompt_build_ms, request_bytes)
         
         # FAST formatting - minimal processing
         ai_response = format_for_speech(ai_response)
         
         return ai_response
         
+    except DeadlineExceeded as e:
+        # Not recorded in history - the caller will repeat themselves
+        print(f"⏱️ LLM missed the turn budget: {e}")
+        if spoken:
+            # The first sentence is already playing; a filler as its
+            # continuation would make no sense, so just stop there
+            return ''
+        return LLM_FILLER_RESPONSE
     except Exception as e:
         print(f"❌ Nemotron error: {e}")
         import traceback
         traceback.print_exc()
+        if spoken:
+            # Same as above: don't tack a fallback line onto a started reply
+            return ''
         return "I'm here. What do you need?"
 
+def build_system_prompt(customer):
+    """System prompt for a call: the shared prefix plus the customer line."""
+    name = customer['name'] if customer else 'Unknown'
+    return f"{SYSTEM_PROMPT_PREFIX}\nCustomer: {name}"
+
+def record_prompt_stats(call_sid, prompt_build_ms, request_bytes):
+    """Record prompt-build time and completion request size for a turn."""
+    print(f"📦 Prompt built in {prompt_build_ms:.3f} ms, ~{request_bytes} request bytes")
+    entry = {
+        'prompt_build_ms': round(prompt_build_ms, 3),
+        'request_bytes': request_bytes,
+        'timestamp': datetime.now().isoformat()
+    }
+    session_store.update(call_sid, lambda session: session.metadata.setdefault('prompt_stats', []).append(entry))
+
+def new_conversation_memory():
+    """Empty token-budgeted memory for a new call."""
+    return ConversationMemory(
+        token_budget=MEMORY_TOKEN_BUDGET,
+        max_turns=MEMORY_MAX_TURNS,
+        summary_tokens=MEMORY_SUMMARY_TOKENS
+    )
+
+def remember_turn(call_sid, user_message, ai_response):
+    """Add an exchange to the call's memory; summarize evicted turns in the background."""
+    def add(session):
+        if session.memory is not None:
+            return session.memory.add_turn(user_message, ai_response)
+    batch = session_store.update(call_sid, add)
+    if batch:
+        memory_executor.submit(summarize_call_memory, call_sid, batch)
+
+def summarize_call_memory(call_sid, batch):
+    """Fold evicted turns into a call's summary until none are left (memory_executor)."""
+    while batch:
+        summary = summarize_turns(*batch)
+        def apply(session):
+            if session.memory is not None:
+                return session.memory.apply_summary(summary)
+        batch = session_store.update(call_sid, apply)
+
+def summarize_turns(previous_summary, turns):
+    """
+    Fold older turns into the call's running summary (runs on memory_executor).
+    
+    Falls back to an extractive summary if the model call fails.
+    """
+    transcript = '\n'.join(f"Caller: {user}\nAgent: {agent}" for user, agent in turns)
+    try:
+        response = openrouter_client.chat.completions.create(
+            model=LLM_MODEL,
+            messages=[
+                {'role': 'system', 'content': "Update the call summary in under 50 words. Keep account facts, numbers, and what the caller still needs."},
+                {'role': 'user', 'content': f"Summary so far: {previous_summary or 'none'}\n\nNew turns:\n{transcript}"}
+            ],
+            max_tokens=MEMORY_SUMMARY_TOKENS,
+            temperature=0.2
+        )
+        summary = (response.choices[0].message.content or '').strip()
+        if summary:
+            return truncate_to_tokens(summary, MEMORY_SUMMARY_TOKENS)
+    except Exception as e:
+        print(f"⚠️ Summary model call failed: {e}")
+    return extractive_summary(previous_summary, turns, MEMORY_SUMMARY_TOKENS)
+
 def should_transfer_to_human(user_message):
     """Check if user wants to speak with a human."""
     transfer_keywords = ['human', 'agent', 'person', 'representative', 'speak to someone', 'real person', 'operator', 'supervisor']
@@ -349,19 +912,28 @@ def recording_status():
     print(f"⏱️ Duration: {recording_duration} seconds")
     
     # Store recording info
-    if call_sid in call_recordings:
-        call_recordings[call_sid]['recordings'].append({
+    recording_info = {
+        'recording_sid': recording_sid,
+        'recording_url': recording_url,
+        'duration': recording_duration,
+        'completed_at': datetime.now().isoformat()
+    }
+    def add_recording(session):
+        recordings = session.metadata.setdefault('recordings', [])
+        if not any(rec['recording_sid'] == recording_sid for rec in recordings):
+            recordings.append(recording_info)
+        return True
+    if session_store.update(call_sid, add_recording):
+        # Download and analyze in the background; Twilio retries of this
+        # callback are no-ops thanks to the RecordingSid idempotency key
+        if recording_jobs.enqueue('process_recording', {
+            'call_sid': call_sid,
             'recording_sid': recording_sid,
-            'recording_url': recording_url,
-            'duration': recording_duration,
-            'completed_at': datetime.now().isoformat()
-        })
-        
-        # Download the recording for later analysis
-        try:
-            download_recording(call_sid, recording_sid, recording_url)
-        except Exception as e:
-            print(f"❌ Error downloading recording: {e}")
+            'recording_url': recording_url
+        }, recording_sid):
+            print(f"📥 Queued download and analysis: {recording_sid}")
+        else:
+            print(f"ℹ️ Recording already queued: {recording_sid}")
     
     return '', 200
 
@@ -374,7 +946,8 @@ def download_recording(call_sid, recording_sid, recording_url):
     response = requests.get(
         audio_url,
         auth=(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN),
-        stream=True
+        stream=True,
+        timeout=60
     )
     
     if response.status_code == 200:
@@ -387,29 +960,43 @@ def download_recording(call_sid, recording_sid, recording_url):
         print(f"✅ Recording saved: {filename}")
         
         # Update metadata with local file path
-        if call_sid in call_recordings:
-            for rec in call_recordings[call_sid]['recordings']:
+        def set_local_file(session):
+            for rec in session.metadata.get('recordings', []):
                 if rec['recording_sid'] == recording_sid:
                     rec['local_file'] = filename
+        session_store.update(call_sid, set_local_file)
         
         # Automatically analyze the recording
         print(f"🔍 Starting automatic tonality analysis for call: {call_sid}")
         analysis_result = analyze_tonality_with_nemo(filename)
         
         # Store analysis with call data
-        if call_sid in call_recordings:
-            call_recordings[call_sid]['tonality_analysis'] = analysis_result
-            
-            # Save analysis to JSON file for persistence
-            save_call_analysis(call_sid, call_recordings[call_sid])
-            
-            # Print detailed analysis to terminal
-            print_analysis_to_terminal(call_sid, call_recordings[call_sid], analysis_result)
+        def set_analysis(session):
+            session.metadata['tonality_analysis'] = analysis_result
+            return session.metadata
+        call_data = session_store.update(call_sid, set_analysis)
+        if call_data is None:
+            # Session already reaped (or held by another worker's memory):
+            # build on the saved analysis so the result isn't dropped
+            call_data = load_call_analysis(call_sid) or {'recordings': []}
+            recordings = call_data.setdefault('recordings', [])
+            recording = next((rec for rec in recordings if rec.get('recording_sid') == recording_sid), None)
+            if recording is None:
+                recording = {'recording_sid': recording_sid, 'recording_url': recording_url}
+                recordings.append(recording)
+            recording['local_file'] = filename
+            call_data['tonality_analysis'] = analysis_result
+        
+        # Save analysis to JSON file for persistence
+        save_call_analysis(call_sid, call_data)
+        
+        # Print detailed analysis to terminal
+        print_analysis_to_terminal(call_sid, call_data, analysis_result)
         
         return filename
     else:
-        print(f"❌ Failed to download recording: {response.status_code}")
-        return None
+        # Raised so the job queue retries it (the MP3 can lag the callback)
+        raise RuntimeError(f"Failed to download recording: {response.status_code}")
 
 def save_call_analysis(call_sid, call_data):
     """Save call analysis to JSON file for persistence."""
@@ -494,9 +1081,10 @@ def print_analysis_to_terminal(call_sid, call_data, analysis_result):
 @app.route("/analyze-call/<call_sid>", methods=['GET'])
 def analyze_call(call_sid):
     """Get call tonality analysis (automatically performed after recording)."""
-    # First check in-memory cache
-    if call_sid in call_recordings:
-        call_data = call_recordings[call_sid]
+    # First check the live session
+    session = session_store.get(call_sid)
+    if session is not None:
+        call_data = session.metadata
     else:
         # Try to load from disk
         call_data = load_call_analysis(call_sid)
@@ -525,9 +1113,8 @@ def analyze_call(call_sid):
             # Save the analysis
             save_call_analysis(call_sid, call_data)
             
-            # Update in-memory cache
-            if call_sid in call_recordings:
-                call_recordings[call_sid] = call_data
+            # Update the live session
+            session_store.update(call_sid, lambda session: session.metadata.update(tonality_analysis=analysis_result))
         except Exception as e:
             return jsonify({'error': str(e)}), 500
     
@@ -644,8 +1231,8 @@ def analyze_tonality_with_nemo(audio_file):
 @app.route("/recordings", methods=['GET'])
 def list_recordings():
     """List all recorded calls with their analysis."""
-    # Combine in-memory and saved recordings
-    all_recordings = dict(call_recordings)
+    # Combine live sessions and saved recordings
+    all_recordings = {session.call_sid: session.metadata for session in session_store.sessions()}
     
     # Load any saved analyses from disk that aren't in memory
     if os.path.exists(ANALYSIS_DIR):
@@ -683,9 +1270,10 @@ def list_recordings():
 @app.route("/call-details/<call_sid>", methods=['GET'])
 def get_call_details(call_sid):
     """Get full details for a specific call including analysis."""
-    # Try in-memory first
-    if call_sid in call_recordings:
-        call_data = call_recordings[call_sid]
+    # Try the live session first
+    session = session_store.get(call_sid)
+    if session is not None:
+        call_data = session.metadata
     else:
         # Load from disk
         call_data = load_call_analysis(call_sid)
@@ -697,27 +1285,68 @@ def get_call_details(call_sid):
         'full_data': call_data
     })
 
+def release_call(session, reason):
+    """Free this process's per-call state for a reaped session, keeping any recordings on disk."""
+    call_sid = session.call_sid
+    print(f"🧹 Evicting {reason} session: {call_sid}")
+    pending_replies.pop(call_sid, None)
+    prefetch_futures.pop(call_sid, None)
+    tool_contexts.pop(call_sid, None)
+    tool_result_cache.invalidate_call(call_sid)
+    if session.metadata.get('recordings') and not os.path.exists(f"{ANALYSIS_DIR}/{call_sid}.json"):
+        # /recordings and /call-details fall back to disk once the session is gone
+        save_call_analysis(call_sid, session.metadata)
+
+@app.route("/job-queue-stats", methods=['GET'])
+def job_queue_stats():
+    """Recording job queue depth, retries and latency percentiles."""
+    return jsonify(recording_jobs.stats())
+
+@app.route("/session-stats", methods=['GET'])
+def session_stats():
+    """Live/ended session gauges, approximate memory and reaper counters."""
+    return jsonify(session_reaper.stats())
+
+@app.route("/tool-cache-stats", methods=['GET'])
+def tool_cache_stats():
+    """Tool result cache hit/miss counters."""
+    return jsonify(tool_result_cache.stats())
+
+@app.route("/llm-hedge-stats", methods=['GET'])
+def llm_hedge_stats():
+    """Hedged request counters and the current hedge delay."""
+    return jsonify(llm_hedger.stats())
+
+@app.route("/connection-stats", methods=['GET'])
+def connection_stats():
+    """Connection reuse and handshake counters for the OpenRouter and Twilio pools."""
+    return jsonify({
+        'openrouter': openrouter_connection_stats.snapshot(),
+        'twilio': twilio_connection_stats(twilio_http),
+    })
+
 @app.route("/end-call", methods=['POST'])
 def end_call():
     """Handle call ending and cleanup."""
     call_sid = request.form.get('CallSid', 'unknown')
     
     print(f"📋 Call ended: {call_sid}")
-    if call_sid in conversation_history:
-        print(f"Conversation had {len(conversation_history[call_sid])} exchanges")
-        # Cleanup conversation history but keep recordings
-        del conversation_history[call_sid]
+    # Drop history and customer data but keep recording metadata
+    def end(session):
+        exchanges = len(session.memory) if session.memory is not None else 0
+        session.end()
+        return exchanges
+    exchanges = session_store.update(call_sid, end)
+    if exchanges is not None:
+        print(f"Conversation had {exchanges} exchanges")
     
-    # Cleanup customer cache
-    if call_sid in customer_cache:
-        del customer_cache[call_sid]
-    if f"{call_sid}_phone" in customer_cache:
-        del customer_cache[f"{call_sid}_phone"]
+    # Drop any reply still streaming
+    pending_replies.pop(call_sid, None)
     
     # Cleanup tool result cache for this call
-    keys_to_delete = [k for k in tool_result_cache.keys() if k.startswith(call_sid)]
-    for key in keys_to_delete:
-        del tool_result_cache[key]
+    prefetch_futures.pop(call_sid, None)
+    tool_contexts.pop(call_sid, None)
+    tool_result_cache.invalidate_call(call_sid)
     
     resp = VoiceResponse()
     resp.say("Thank you for calling. Goodbye!", 
@@ -727,6 +1356,11 @@ def end_call():
     
     return str(resp), 200, {'Content-Type': 'text/xml'}
 
+# Start job workers at the end of the module, once download_recording and
+# everything it calls (analyze_tonality_with_nemo, save_call_analysis, ...)
+# is defined: queued jobs from a previous run may be picked up immediately
+recording_jobs.start()
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     print(f"🚀 Starting Conversational AI Voice Server on port {port}")